@@ -11,7 +11,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
 from sklearn.datasets import load_iris
-from sklearn.neighbors import KNeighborsClassifier
+
+from knn import ClasificadorKNN, graficar_frontera_decision
 
 # Cargar el dataset de Iris
 iris = load_iris()
@@ -28,11 +29,11 @@ nuevos_puntos = [[5.1, 1.8], [1.5, 0.2], [4.5, 1.5], [6.0, 2.5], [2.0, 0.5]]
 
 # Crear y entrenar el modelo KNN con k=5
 k = 5
-knn = KNeighborsClassifier(n_neighbors=k)
+knn = ClasificadorKNN(n_neighbors=k)
 knn.fit(X, y) #X: Son los datos de entrenamiento ,y: Son los datos objetivo o etiquetas
 
-# Clasificar los nuevos puntos
-predicciones = knn.predict(nuevos_puntos)
+# Clasificar los nuevos puntos: una sola búsqueda retorna predicciones, vecinos y distancias
+predicciones, indices_vecinos, distancias_vecinos, _ = knn.clasificar(nuevos_puntos)
 
 # Imprimir información
 print("--- Tabla de los primeros 10 datos procesados ---")
@@ -40,11 +41,15 @@ print(df.head(10).to_markdown(index=False, numalign="left", stralign="left"))
 print("\n--- Predicciones para los nuevos puntos ---")
 for i, punto in enumerate(nuevos_puntos):
     prediccion = predicciones[i]
-    print(f"Punto: {punto}, Predicción: {target_names[prediccion]}")
+    print(f"Punto: {punto}, Predicción: {target_names[prediccion]}, "
+          f"Vecinos: {indices_vecinos[i].tolist()}, Distancia media: {distancias_vecinos[i].mean():.3f}")
 
 # Visualizar
 plt.figure(figsize=(10, 8))
 
+# Regiones de decisión del modelo (malla de 500 x 500 predicha por lotes)
+graficar_frontera_decision(knn, X, resolucion=500)
+
 # Graficar los datos por especie
 for especie in np.unique(y):
     cluster = df[df['Especie'] == target_names[especie]]
@@ -53,12 +58,9 @@ for especie in np.unique(y):
 # Graficar los nuevos puntos
 plt.scatter([p[0] for p in nuevos_puntos], [p[1] for p in nuevos_puntos], color='black', marker='X', s=100, label='Nuevos Puntos')
 
-# Graficar los vecinos más cercanos para cada nuevo punto
-for i, punto in enumerate(nuevos_puntos):
-    distancias, indices = knn.kneighbors([punto], n_neighbors=k)
-    for idx in indices[0]:
-        vecino = X[idx]
-        plt.scatter(vecino[0], vecino[1], edgecolor='red', facecolor='none', s=200, linewidths=2)
+# Graficar los vecinos más cercanos de todos los nuevos puntos (reutiliza la búsqueda anterior)
+vecinos = X[indices_vecinos.ravel()]
+plt.scatter(vecinos[:, 0], vecinos[:, 1], edgecolor='red', facecolor='none', s=200, linewidths=2)
 
 # Añadir texto con la predicción para cada nuevo punto
 for i, punto in enumerate(nuevos_puntos):
@@ -8,9 +8,12 @@ Original file is located at
 """
 
 import pandas as pd
+import matplotlib.pyplot as plt
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.neighbors import KNeighborsClassifier
 
+from knn import graficar_frontera_decision, seleccionar_k
+
 def predecir_jugador_profesional_knn():
     """
     Predice si el jugador con ID 21 es profesional usando el algoritmo K-Nearest Neighbors (KNN).
@@ -37,12 +40,12 @@ def predecir_jugador_profesional_knn():
     X_escalado = scaler.fit_transform(X)
 
     # 4. Entrenar el modelo KNN
-    # Se elige un valor de k (número de vecinos)
-    # Un valor común es la raíz cuadrada del número de muestras
-    k = int(len(X) ** 0.5)
-    # Asegurarse de que k sea impar para evitar empates
-    if k % 2 == 0:
-        k += 1
+    # Se elige k (número de vecinos) con validación cruzada de 5 folds sobre los k impares
+    # (impares para evitar empates); cada fold hace una sola búsqueda de vecinos
+    k, tabla_k = seleccionar_k(X_escalado, y, cv=5)
+    print("Exactitud de validación cruzada por k:")
+    print(tabla_k[['k', 'exactitud_media', 'exactitud_std']].to_string(index=False))
+    print(f"k seleccionado: {k}\n")
 
     knn_model = KNeighborsClassifier(n_neighbors=k)
     knn_model.fit(X_escalado, y)
@@ -73,5 +76,17 @@ def predecir_jugador_profesional_knn():
               f"Agilidad {vecino_info['Agilidad']}, Profesional: {vecino_info['Jugador_profesional']}")
     print(f"\nLa predicción se basa en la mayoría de votos de estos {k} vecinos.")
 
+    # 6. Visualizar las regiones de decisión en el espacio normalizado
+    plt.figure(figsize=(8, 6))
+    graficar_frontera_decision(knn_model, X_escalado, y, resolucion=500, margen=0.05)
+    plt.scatter(jugador21_escalado[:, 0], jugador21_escalado[:, 1], color='black', marker='X', s=150,
+                label=f'Jugador 21 ({prediccion[0]})')
+    plt.title(f"Regiones de decisión KNN (k={k}) - Jugador profesional")
+    plt.xlabel("Velocidad (normalizada)")
+    plt.ylabel("Agilidad (normalizada)")
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
 # Ejecutar la función
 predecir_jugador_profesional_knn()
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Paquete de búsqueda de vecinos más cercanos (KNN) para grandes volúmenes de puntos
+"""
+
+from .indice import IndiceVecinos
+
+from .clasificador import ClasificadorKNN, ResultadoKNN
+
+from .seleccion_k import seleccionar_k
+
+from .fronteras import (
+    predecir_malla,
+    graficar_frontera_decision
+)
+
+__all__ = [
+    'IndiceVecinos',
+    'ClasificadorKNN',
+    'ResultadoKNN',
+    'seleccionar_k',
+    'predecir_malla',
+    'graficar_frontera_decision'
+]
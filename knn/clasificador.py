@@ -0,0 +1,90 @@
+"""
+Clasificador KNN por lotes: predicciones, vecinos y distancias en una sola búsqueda
+"""
+
+import copy
+from typing import NamedTuple
+
+import numpy as np
+
+from .indice import IndiceVecinos, TAMANO_LOTE
+
+
+class ResultadoKNN(NamedTuple):
+    """Resultado de ClasificadorKNN.clasificar para un lote de puntos."""
+    predicciones: np.ndarray   # (n,) etiquetas predichas
+    indices: np.ndarray        # (n, k) posiciones de los vecinos en los datos de entrenamiento
+    distancias: np.ndarray     # (n, k) distancias a los vecinos, de menor a mayor
+    probabilidades: np.ndarray  # (n, n_clases) fracción de votos por clase (orden de classes_)
+
+
+class ClasificadorKNN:
+    """
+    Clasificador K vecinos más cercanos (votación uniforme) sobre un IndiceVecinos
+
+    A diferencia de usar knn.predict() y luego knn.kneighbors() punto por punto,
+    clasificar() hace una sola búsqueda por lote y retorna a la vez las predicciones,
+    los índices de los vecinos y sus distancias, para graficar y explicar sin repetirla.
+    Los empates se resuelven a favor de la clase menor, como KNeighborsClassifier.
+
+    Parámetros:
+    - n_neighbors: Número de vecinos (k)
+    - indice: IndiceVecinos ya construido (se usa sin reconstruir), uno sin construir
+      (plantilla de parámetros) o None para crear uno con metodo
+    - metodo: Método del índice ('auto', 'kd_tree', 'ball_tree', 'brute', 'particiones')
+    """
+
+    def __init__(self, n_neighbors=5, indice=None, metodo='auto'):
+        self.n_neighbors = n_neighbors
+        self.indice = indice
+        self.metodo = metodo
+
+    def fit(self, X, y):
+        """
+        Guarda las etiquetas codificadas y construye el índice ajustado en indice_
+
+        El índice se reconstruye en cada llamada salvo que se haya entregado uno ya
+        construido en el constructor (se usa tal cual); uno sin construir se toma como
+        plantilla de parámetros y no se modifica.
+        """
+        self.classes_, self._y_codificado = np.unique(np.asarray(y), return_inverse=True)
+        if self.indice is not None and getattr(self.indice, 'n_puntos_', None) is not None:
+            if self.indice.n_puntos_ != len(self._y_codificado):
+                raise ValueError(f"El índice entregado tiene {self.indice.n_puntos_} puntos "
+                                 f"y y tiene {len(self._y_codificado)}")
+            self.indice_ = self.indice
+        else:
+            plantilla = self.indice if self.indice is not None else IndiceVecinos(metodo=self.metodo)
+            self.indice_ = copy.copy(plantilla).fit(X)
+        return self
+
+    def votar(self, indices):
+        """Cuenta los votos de los vecinos de forma vectorizada; retorna (predicciones, probabilidades)."""
+        n_clases = len(self.classes_)
+        etiquetas = self._y_codificado[indices]
+        filas = np.repeat(np.arange(len(indices)), indices.shape[1])
+        votos = np.bincount(filas * n_clases + etiquetas.ravel(),
+                            minlength=len(indices) * n_clases).reshape(len(indices), n_clases)
+        return self.classes_[np.argmax(votos, axis=1)], votos / indices.shape[1]
+
+    def clasificar(self, X, n_neighbors=None, tamano_lote=TAMANO_LOTE, n_jobs=1):
+        """
+        Clasifica un lote de puntos con una sola búsqueda de vecinos
+
+        Retorna:
+        - ResultadoKNN(predicciones, indices, distancias, probabilidades)
+        """
+        k = n_neighbors or self.n_neighbors
+        distancias, indices = self.indice_.kneighbors(X, n_neighbors=k, tamano_lote=tamano_lote, n_jobs=n_jobs)
+        predicciones, probabilidades = self.votar(indices)
+        return ResultadoKNN(predicciones, indices, distancias, probabilidades)
+
+    def predict(self, X):
+        return self.clasificar(X).predicciones
+
+    def predict_proba(self, X):
+        return self.clasificar(X).probabilidades
+
+    def kneighbors(self, X, n_neighbors=None, return_distance=True):
+        return self.indice_.kneighbors(X, n_neighbors=n_neighbors or self.n_neighbors,
+                                      return_distance=return_distance)
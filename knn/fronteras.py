@@ -0,0 +1,124 @@
+"""
+Mapas de regiones de decisión para clasificadores KNN (malla densa predicha por lotes)
+"""
+
+import weakref
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Puntos de la malla por lote de predicción (memoria acotada)
+TAMANO_LOTE_MALLA = 100_000
+
+# Atributos que cambian de objeto en cada fit() (KNeighborsClassifier, ClasificadorKNN, ...)
+_ATRIBUTOS_AJUSTE = ('_fit_X', '_y', 'indice_', '_y_codificado', 'classes_')
+
+# Predicciones de malla por modelo: {modelo: (estado de ajuste, {(k, limites, resolucion): Z})}
+_CACHE_MALLAS = weakref.WeakKeyDictionary()
+
+
+def _clave_cache(modelo, limites, resolucion):
+    return (getattr(modelo, 'n_neighbors', None), tuple(float(v) for v in limites), resolucion)
+
+
+def _estado_ajuste(modelo):
+    """Referencias a los datos ajustados del modelo; cambian si se vuelve a llamar a fit()."""
+    return tuple(getattr(modelo, atributo, None) for atributo in _ATRIBUTOS_AJUSTE)
+
+
+def _cache_modelo(modelo):
+    """Mallas guardadas del modelo, descartadas si fue reajustado desde que se guardaron."""
+    estado = _estado_ajuste(modelo)
+    guardado = _CACHE_MALLAS.get(modelo)
+    # Se compara por identidad: la caché guarda las referencias, así que no hay reutilización de ids
+    if guardado is None or any(a is not b for a, b in zip(guardado[0], estado)):
+        guardado = (estado, {})
+        _CACHE_MALLAS[modelo] = guardado
+    return guardado[1]
+
+
+def limites_datos(X, margen=0.5):
+    """Límites (x_min, x_max, y_min, y_max) de las dos primeras columnas de X con un margen."""
+    X = np.asarray(X, dtype=float)
+    return (X[:, 0].min() - margen, X[:, 0].max() + margen,
+            X[:, 1].min() - margen, X[:, 1].max() + margen)
+
+
+def predecir_malla(modelo, limites, resolucion=500, tamano_lote=TAMANO_LOTE_MALLA, usar_cache=True):
+    """
+    Predice la clase de cada celda de una malla regular en lotes
+
+    Las coordenadas de cada lote se generan a partir de su rango de posiciones, sin
+    construir la malla completa; el resultado se guarda en caché por modelo, k,
+    límites y resolución, y se invalida al reajustar el modelo.
+
+    Parámetros:
+    - modelo: Clasificador ajustado con predict() (ClasificadorKNN, KNeighborsClassifier, ...)
+    - limites: (x_min, x_max, y_min, y_max)
+    - resolucion: Celdas por eje (entero o tupla (nx, ny))
+    - tamano_lote: Puntos de la malla por llamada a predict()
+    - usar_cache: Reutilizar la malla ya calculada para el mismo modelo ajustado y k
+
+    Retorna:
+    - xs, ys: Coordenadas de los centros de las celdas en cada eje
+    - Z: Arreglo (ny, nx) con el índice de clase (posición en modelo.classes_)
+    """
+    nx, ny = (resolucion, resolucion) if np.isscalar(resolucion) else resolucion
+    x_min, x_max, y_min, y_max = limites
+    xs = np.linspace(x_min, x_max, nx)
+    ys = np.linspace(y_min, y_max, ny)
+
+    clave = _clave_cache(modelo, limites, (nx, ny))
+    cache = _cache_modelo(modelo) if usar_cache else {}
+    if clave in cache:
+        return xs, ys, cache[clave]
+
+    clases = np.asarray(modelo.classes_)
+    Z = np.empty(nx * ny, dtype=np.intp)
+    for inicio in range(0, nx * ny, tamano_lote):
+        posiciones = np.arange(inicio, min(inicio + tamano_lote, nx * ny))
+        puntos = np.column_stack([xs[posiciones % nx], ys[posiciones // nx]])
+        Z[inicio:inicio + len(posiciones)] = np.searchsorted(clases, modelo.predict(puntos))
+    Z = Z.reshape(ny, nx)
+
+    cache[clave] = Z
+    return xs, ys, Z
+
+
+def graficar_frontera_decision(modelo, X, y=None, resolucion=500, margen=0.5, ax=None, cmap='Pastel1',
+                               nombres_clases=None, ruta=None, tamano_lote=TAMANO_LOTE_MALLA):
+    """
+    Dibuja las regiones de decisión del modelo con pcolormesh y, opcionalmente, los datos
+
+    Parámetros:
+    - modelo: Clasificador ajustado sobre dos características
+    - X: Datos de entrenamiento (se usan para los límites y, con y, para el scatter)
+    - y: Etiquetas de X (opcional)
+    - resolucion: Celdas por eje de la malla (p. ej. 1000 para 1000 x 1000)
+    - margen: Margen alrededor de los datos
+    - ax: Ejes donde dibujar (por defecto los actuales)
+    - cmap: Mapa de colores de las regiones
+    - nombres_clases: Nombres para la leyenda del scatter (por defecto modelo.classes_)
+    - ruta: Guardar la figura en este archivo (opcional)
+
+    Retorna:
+    - ax con el mapa dibujado
+    """
+    ax = ax or plt.gca()
+    clases = np.asarray(modelo.classes_)
+    xs, ys, Z = predecir_malla(modelo, limites_datos(X, margen), resolucion, tamano_lote)
+
+    ax.pcolormesh(xs, ys, Z, cmap=cmap, shading='nearest', vmin=0, vmax=max(len(clases) - 1, 1),
+                  alpha=0.6, rasterized=True)
+
+    if y is not None:
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y)
+        nombres = nombres_clases if nombres_clases is not None else clases
+        for i, clase in enumerate(clases):
+            seleccion = y == clase
+            ax.scatter(X[seleccion, 0], X[seleccion, 1], label=str(nombres[i]), edgecolor='k', linewidths=0.5)
+
+    if ruta:
+        ax.figure.savefig(ruta)
+    return ax
@@ -0,0 +1,81 @@
+"""
+Selección automática de k para KNN con validación cruzada en paralelo
+"""
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold
+
+from .indice import IndiceVecinos, TAMANO_LOTE
+
+
+def _evaluar_pliegue(X, y_codificado, n_clases, indices_train, indices_val, valores_k, metodo):
+    """
+    Exactitud de todos los k en un fold con una sola búsqueda de vecinos (k máximo)
+
+    Los vecinos vienen ordenados por distancia, así que los votos de los primeros k
+    vecinos se obtienen para todos los k a la vez con una suma acumulada.
+    """
+    indice = IndiceVecinos(metodo=metodo).fit(X[indices_train])
+    vecinos = indice.kneighbors(X[indices_val], n_neighbors=max(valores_k), return_distance=False)
+
+    y_train, y_val = y_codificado[indices_train], y_codificado[indices_val]
+    aciertos = np.zeros(len(valores_k))
+    posiciones_k = np.asarray(valores_k) - 1
+    # Por bloques de filas para acotar la memoria de la tabla de votos
+    for inicio in range(0, len(vecinos), TAMANO_LOTE):
+        etiquetas = y_train[vecinos[inicio:inicio + TAMANO_LOTE]]                      # (n, k_max)
+        votos = np.cumsum(etiquetas[:, :, None] == np.arange(n_clases), axis=1, dtype=np.int32)
+        # argmax elige la clase menor en caso de empate, como KNeighborsClassifier
+        predicciones = np.argmax(votos[:, posiciones_k, :], axis=2)                    # (n, n_k)
+        aciertos += np.sum(predicciones == y_val[inicio:inicio + TAMANO_LOTE, None], axis=0)
+    return aciertos / len(indices_val)
+
+
+def seleccionar_k(X, y, valores_k=None, cv=5, n_jobs=-1, random_state=42, metodo='auto'):
+    """
+    Elige el número de vecinos k con validación cruzada K-fold estratificada
+
+    En cada fold se hace una única búsqueda con el k máximo y se reutiliza para todos
+    los k menores (sin reajustar un modelo por k); los folds se evalúan en paralelo.
+
+    Parámetros:
+    - X: Características ya escaladas (n_muestras x n_dimensiones)
+    - y: Etiquetas
+    - valores_k: k a evaluar (por defecto impares de 1 hasta min(49, tamaño del fold de entrenamiento))
+    - cv: Número de folds
+    - n_jobs: Procesos en paralelo (-1 = todos los núcleos)
+    - random_state: Semilla de la partición en folds
+    - metodo: Método del IndiceVecinos ('auto', 'kd_tree', 'ball_tree', 'brute', 'particiones')
+
+    Retorna:
+    - mejor_k: k con mayor exactitud media (el menor en caso de empate)
+    - tabla: DataFrame con k, exactitud media, desviación estándar y exactitud por fold
+    """
+    X = np.asarray(X, dtype=np.float64)
+    clases, y_codificado = np.unique(np.asarray(y), return_inverse=True)
+    n_train_min = len(X) - int(np.ceil(len(X) / cv))
+    if valores_k is None:
+        valores_k = range(1, min(49, n_train_min) + 1, 2)
+    valores_k = sorted(set(int(k) for k in valores_k))
+    if valores_k[0] < 1 or valores_k[-1] > n_train_min:
+        raise ValueError(f"Los valores de k deben estar entre 1 y {n_train_min} (tamaño del fold de entrenamiento)")
+
+    pliegues = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(X, y_codificado)
+    exactitudes = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluar_pliegue)(X, y_codificado, len(clases), indices_train, indices_val, valores_k, metodo)
+        for indices_train, indices_val in pliegues
+    )
+
+    por_fold = np.array(exactitudes).T  # (n_k, cv)
+    tabla = pd.DataFrame({
+        'k': valores_k,
+        'exactitud_media': por_fold.mean(axis=1),
+        'exactitud_std': por_fold.std(axis=1),
+    })
+    for i in range(por_fold.shape[1]):
+        tabla[f'fold_{i + 1}'] = por_fold[:, i]
+
+    mejor_k = int(tabla.loc[tabla['exactitud_media'].idxmax(), 'k'])
+    return mejor_k, tabla
@@ -4,14 +4,57 @@ Paquete de métricas de clasificación para evaluación de modelos
 
 from .metricas_clasificacion import (
     compute_metrics,
+    compute_metrics_batch,
     print_report,
     safe_div,
+    safe_div_array,
     as_percent
 )
 
+from .metricas_streaming import ConfusionAccumulator
+
+from .metricas_multiclase import (
+    multiclass_confusion_matrix,
+    compute_multiclass_metrics
+)
+
+from .metricas_curvas import (
+    threshold_confusion_matrices,
+    compute_curves
+)
+
+from .metricas_intervalos import (
+    wilson_interval,
+    wilson_confidence_intervals,
+    bootstrap_confidence_intervals
+)
+
+from .reportes import (
+    render_report,
+    reports_to_frame,
+    write_reports,
+    summarize_reports,
+    format_classification_report
+)
+
 __all__ = [
     'compute_metrics',
+    'compute_metrics_batch',
     'print_report',
     'safe_div',
-    'as_percent'
+    'safe_div_array',
+    'as_percent',
+    'ConfusionAccumulator',
+    'multiclass_confusion_matrix',
+    'compute_multiclass_metrics',
+    'threshold_confusion_matrices',
+    'compute_curves',
+    'wilson_interval',
+    'wilson_confidence_intervals',
+    'bootstrap_confidence_intervals',
+    'render_report',
+    'reports_to_frame',
+    'write_reports',
+    'summarize_reports',
+    'format_classification_report'
 ]
@@ -1,8 +1,20 @@
 
+import numpy as np
+import pandas as pd
+
+
 def safe_div(numerator: float, denominator: float) -> float:
     return numerator / denominator if denominator != 0 else 0.0
 
 
+def safe_div_array(numerator, denominator) -> np.ndarray:
+    """Versión vectorizada de safe_div: 0.0 donde el denominador es 0."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator != 0)
+
+
 def as_percent(value: float) -> str:
     """Formatea un valor [0,1] como porcentaje con 2 decimales."""
     return f"{value * 100:.2f}%"
@@ -85,15 +97,131 @@ def compute_metrics(tp: int, fp: int, tn: int, fn: int) -> dict[str, float]:
     }
 
 
+def compute_metrics_batch(
+    tp=None,
+    fp=None,
+    tn=None,
+    fn=None,
+    confusion_matrices=None,
+    as_frame: bool = False,
+) -> "dict[str, np.ndarray] | pd.DataFrame":
+    """
+    Calcula las métricas de compute_metrics para muchas matrices de confusión a la vez.
+
+    Parámetros:
+      - tp, fp, tn, fn: arreglos (o escalares) de conteos de igual forma
+      - confusion_matrices: alternativa a los conteos; arreglo N×2×2 con el
+        formato de sklearn.metrics.confusion_matrix: [[TN, FP], [FN, TP]]
+      - as_frame: si es True, retorna un DataFrame con una fila por matriz
+
+    Retorna un diccionario con las mismas claves que compute_metrics, donde cada
+    valor es un arreglo NumPy. La división por cero se resuelve como en safe_div.
+    """
+    if confusion_matrices is not None:
+        cms = np.asarray(confusion_matrices, dtype=float)
+        if cms.shape[-2:] != (2, 2):
+            raise ValueError("confusion_matrices debe tener forma (..., 2, 2)")
+        tn, fp, fn, tp = cms[..., 0, 0], cms[..., 0, 1], cms[..., 1, 0], cms[..., 1, 1]
+    elif tp is None or fp is None or tn is None or fn is None:
+        raise ValueError("Debe indicar tp, fp, tn y fn, o confusion_matrices")
+
+    tp, fp, tn, fn = np.broadcast_arrays(
+        *(np.asarray(c, dtype=float) for c in (tp, fp, tn, fn))
+    )
+    total = tp + fp + tn + fn
+
+    precision = safe_div_array(tp, tp + fp)
+    prevalence = safe_div_array(tp + fn, total)
+
+    metrics = {
+        "total": total,
+        "tp": tp,
+        "fp": fp,
+        "tn": tn,
+        "fn": fn,
+        "accuracy": safe_div_array(tp + tn, total),
+        "precision": precision,
+        "recall": safe_div_array(tp, tp + fn),
+        "specificity": safe_div_array(tn, tn + fp),
+        "f1": safe_div_array(2 * tp, (2 * tp) + fp + fn),
+        "npv": safe_div_array(tn, tn + fn),
+        "fpr": safe_div_array(fp, fp + tn),
+        "fnr": safe_div_array(fn, fn + tp),
+        "prevalence": prevalence,
+        "predicted_positive_rate": safe_div_array(tp + fp, total),
+        "fdr": safe_div_array(fp, fp + tp),
+        "lift": safe_div_array(precision, prevalence),
+    }
+
+    if as_frame:
+        return pd.DataFrame({name: values.ravel() for name, values in metrics.items()})
+    return metrics
+
+
+def _print_multiclass_report(metrics: dict, as_table: bool = False) -> None:
+    """Imprime el reporte de compute_multiclass_metrics: una fila por clase y promedios."""
+    columns = [
+        ("ACC", "accuracy"),
+        ("SEN", "recall"),
+        ("SPE", "specificity"),
+        ("PPV", "precision"),
+        ("NPV", "npv"),
+        ("F1", "f1"),
+        ("Lift", "lift"),
+    ]
+
+    def fmt(key: str, value: float) -> str:
+        return f"{value:.3f}" if key == "lift" else as_percent(value)
+
+    per_class = metrics["per_class"]
+    rows = [
+        (str(label), str(int(support)), [fmt(key, per_class[key][i]) for _, key in columns])
+        for i, (label, support) in enumerate(zip(metrics["labels"], metrics["support"]))
+    ]
+    for name, average in (("Macro", "macro"), ("Micro", "micro"), ("Ponderado", "weighted")):
+        rows.append((name, "", [fmt(key, metrics[average][key]) for _, key in columns]))
+
+    col1 = max(len("Clase"), *(len(name) for name, _, _ in rows)) + 2
+    widths = [max(len(header), 8) + 1 for header, _ in columns]
+    line = "+" + "-" * (col1 + 10 + sum(widths) + 1) + "+"
+
+    print("=== Conteos ===")
+    print(f"Muestras totales: {int(metrics['total'])}")
+    print(f"Clases: {len(metrics['labels'])}")
+    print(f"Exactitud global (traza / total): {as_percent(metrics['overall_accuracy'])}")
+
+    print("\n=== Métricas por clase (uno contra el resto) ===")
+    if as_table:
+        print(line)
+    header = "Clase".ljust(col1) + "Soporte".rjust(9) + "".join(
+        h.rjust(w) for (h, _), w in zip(columns, widths)
+    )
+    print(f"| {header} |" if as_table else header)
+    if as_table:
+        print(line)
+    for i, (name, support, values) in enumerate(rows):
+        if i == len(metrics["labels"]):
+            print(line if as_table else "-" * len(header))
+        text = name.ljust(col1) + support.rjust(9) + "".join(v.rjust(w) for v, w in zip(values, widths))
+        print(f"| {text} |" if as_table else text)
+    if as_table:
+        print(line)
+
+
 def print_report(metrics: dict[str, float], as_table: bool = False) -> None:
     """Imprime las métricas calculadas.
 
     Parámetros:
-      - metrics: diccionario devuelto por compute_metrics
+      - metrics: diccionario devuelto por compute_metrics o por
+                 compute_multiclass_metrics (tabla por clase y promedios)
       - as_table: si es True, muestra una tabla alineada con las métricas
                   en el mismo orden de la imagen compartida.
     """
 
+    if "per_class" in metrics:
+        _print_multiclass_report(metrics, as_table)
+        return
+
     print("=== Conteos ===")
     print(f"Muestras totales: {int(metrics['total'])}")
     print(f"Verdaderos positivos (TP): {int(metrics['tp'])}")
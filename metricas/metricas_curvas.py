@@ -0,0 +1,101 @@
+"""
+Curvas ROC, PR, F1 y Lift por barrido de umbrales con un solo ordenamiento
+"""
+
+import numpy as np
+
+from .metricas_clasificacion import compute_metrics_batch
+
+
+def threshold_confusion_matrices(scores, y_true, positive_label=1) -> dict[str, np.ndarray]:
+    """
+    Calcula las matrices de confusión para todos los umbrales distintos en O(n log n).
+
+    Se ordenan los scores de mayor a menor una sola vez; con sumas acumuladas de
+    positivos y negativos se obtienen TP y FP al predecir positivo todo score >= umbral.
+    Solo se conserva el último índice de cada score repetido (un umbral por valor).
+
+    Parámetros:
+      - scores: puntuación o probabilidad de la clase positiva
+      - y_true: etiquetas reales
+      - positive_label: etiqueta de la clase positiva
+
+    Retorna arreglos thresholds, tp, fp, tn, fn (umbrales en orden decreciente).
+    """
+    scores = np.asarray(scores, dtype=float).ravel()
+    y_true = np.asarray(y_true).ravel() == positive_label
+    if scores.shape != y_true.shape:
+        raise ValueError(
+            f"scores y y_true deben tener el mismo tamaño ({scores.size} != {y_true.size})"
+        )
+
+    order = np.argsort(scores, kind="mergesort")[::-1]
+    scores = scores[order]
+    y_true = y_true[order]
+
+    # Último índice de cada bloque de scores iguales
+    distinct = np.flatnonzero(np.diff(scores)) if scores.size else np.array([], dtype=int)
+    last = np.r_[distinct, scores.size - 1] if scores.size else distinct
+
+    tp = np.cumsum(y_true, dtype=np.int64)[last]
+    fp = (last + 1) - tp
+    positives = int(y_true.sum())
+    negatives = scores.size - positives
+
+    return {
+        "thresholds": scores[last],
+        "tp": tp,
+        "fp": fp,
+        "tn": negatives - fp,
+        "fn": positives - tp,
+    }
+
+
+def compute_curves(scores, y_true, positive_label=1) -> dict:
+    """
+    Calcula las curvas ROC, PR, F1-vs-umbral y Lift, junto con sus áreas.
+
+    Todas las métricas de compute_metrics se evalúan por umbral con
+    compute_metrics_batch, sin crear objetos Python por umbral.
+
+    Parámetros:
+      - scores: puntuación o probabilidad de la clase positiva
+      - y_true: etiquetas reales
+      - positive_label: etiqueta de la clase positiva
+
+    Retorna un diccionario con:
+      - thresholds y metrics (todas las métricas por umbral, como arreglos)
+      - roc: fpr, tpr (incluye el punto (0, 0)) y auc
+      - pr: recall, precision y average_precision (AP, suma escalonada)
+      - f1: f1 por umbral, best_threshold y best_f1
+      - lift: fracción de población predicha positiva y lift por umbral
+    """
+    counts = threshold_confusion_matrices(scores, y_true, positive_label)
+    thresholds = counts.pop("thresholds")
+    metrics = compute_metrics_batch(**counts)
+
+    # ROC: se agrega el origen (umbral por encima del máximo score)
+    fpr = np.r_[0.0, metrics["fpr"]]
+    tpr = np.r_[0.0, metrics["recall"]]
+    roc_auc = float(np.trapezoid(tpr, fpr)) if fpr.size > 1 else 0.0
+
+    # PR: AP = sum((R_n - R_{n-1}) * P_n)
+    recall = metrics["recall"]
+    precision = metrics["precision"]
+    average_precision = float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+
+    f1 = metrics["f1"]
+    best = int(np.argmax(f1)) if f1.size else None
+
+    return {
+        "thresholds": thresholds,
+        "metrics": metrics,
+        "roc": {"fpr": fpr, "tpr": tpr, "auc": roc_auc},
+        "pr": {"recall": recall, "precision": precision, "average_precision": average_precision},
+        "f1": {
+            "f1": f1,
+            "best_threshold": float(thresholds[best]) if best is not None else None,
+            "best_f1": float(f1[best]) if best is not None else 0.0,
+        },
+        "lift": {"population": metrics["predicted_positive_rate"], "lift": metrics["lift"]},
+    }
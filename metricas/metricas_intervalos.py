@@ -0,0 +1,126 @@
+"""
+Intervalos de confianza (bootstrap y Wilson) para las métricas de compute_metrics
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .metricas_clasificacion import compute_metrics, compute_metrics_batch, safe_div_array
+from .metricas_multiclase import RATE_METRICS
+
+# Numerador y denominador de cada métrica que es una proporción (para Wilson)
+PROPORTION_METRICS = {
+    "accuracy": (lambda tp, fp, tn, fn: tp + tn, lambda tp, fp, tn, fn: tp + fp + tn + fn),
+    "precision": (lambda tp, fp, tn, fn: tp, lambda tp, fp, tn, fn: tp + fp),
+    "recall": (lambda tp, fp, tn, fn: tp, lambda tp, fp, tn, fn: tp + fn),
+    "specificity": (lambda tp, fp, tn, fn: tn, lambda tp, fp, tn, fn: tn + fp),
+    "npv": (lambda tp, fp, tn, fn: tn, lambda tp, fp, tn, fn: tn + fn),
+    "fpr": (lambda tp, fp, tn, fn: fp, lambda tp, fp, tn, fn: fp + tn),
+    "fnr": (lambda tp, fp, tn, fn: fn, lambda tp, fp, tn, fn: fn + tp),
+    "fdr": (lambda tp, fp, tn, fn: fp, lambda tp, fp, tn, fn: fp + tp),
+    "prevalence": (lambda tp, fp, tn, fn: tp + fn, lambda tp, fp, tn, fn: tp + fp + tn + fn),
+    "predicted_positive_rate": (lambda tp, fp, tn, fn: tp + fp, lambda tp, fp, tn, fn: tp + fp + tn + fn),
+}
+
+
+def wilson_interval(successes, n, confidence: float = 0.95) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Intervalo de Wilson para una proporción (vectorizado).
+
+    Retorna (lower, upper); con n = 0 el intervalo es [0, 0], igual que safe_div.
+    """
+    successes = np.asarray(successes, dtype=float)
+    n = np.asarray(n, dtype=float)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    p = safe_div_array(successes, n)
+    denom = 1 + safe_div_array(z ** 2, n)
+    center = safe_div_array(p + safe_div_array(z ** 2, 2 * n), denom)
+    half = safe_div_array(z * np.sqrt(safe_div_array(p * (1 - p), n) + safe_div_array(z ** 2, 4 * n ** 2)), denom)
+    empty = n == 0
+    return np.where(empty, 0.0, center - half), np.where(empty, 0.0, center + half)
+
+
+def wilson_confidence_intervals(tp: int, fp: int, tn: int, fn: int, confidence: float = 0.95) -> pd.DataFrame:
+    """
+    Intervalos de Wilson para las métricas de compute_metrics que son proporciones.
+
+    F1 y Lift no son proporciones simples: sus filas quedan en NaN (usar bootstrap).
+    """
+    point = compute_metrics(tp=tp, fp=fp, tn=tn, fn=fn)
+    rows = []
+    for name in RATE_METRICS:
+        lower = upper = np.nan
+        if name in PROPORTION_METRICS:
+            num, den = PROPORTION_METRICS[name]
+            lower, upper = wilson_interval(num(tp, fp, tn, fn), den(tp, fp, tn, fn), confidence)
+        rows.append({"metric": name, "estimate": point[name], "lower": float(lower), "upper": float(upper)})
+    return pd.DataFrame(rows).set_index("metric")
+
+
+def _bootstrap_replicates(counts: np.ndarray, n_boot: int, seed) -> dict[str, np.ndarray]:
+    """Genera n_boot tablas 2×2 por sorteo multinomial y calcula sus métricas en lote."""
+    rng = np.random.default_rng(seed)
+    total = int(counts.sum())
+    draws = rng.multinomial(total, counts / total, size=n_boot)
+    return compute_metrics_batch(tp=draws[:, 0], fp=draws[:, 1], tn=draws[:, 2], fn=draws[:, 3])
+
+
+def bootstrap_confidence_intervals(
+    tp: int,
+    fp: int,
+    tn: int,
+    fn: int,
+    n_boot: int = 10_000,
+    confidence: float = 0.95,
+    random_state=None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """
+    Intervalos de confianza bootstrap (percentil) para todas las métricas de compute_metrics.
+
+    Remuestrear N observaciones de una tabla 2×2 equivale a un sorteo multinomial
+    de los cuatro conteos, así que las B réplicas se generan en un solo arreglo
+    B×4 y se evalúan con compute_metrics_batch (sin bucles por réplica).
+
+    Parámetros:
+      - tp, fp, tn, fn: conteos de la matriz de confusión observada
+      - n_boot: número de réplicas bootstrap (B)
+      - confidence: nivel de confianza del intervalo
+      - random_state: semilla para reproducibilidad
+      - n_jobs: procesos para repartir las réplicas (útil solo con B muy grande; -1 = todos los núcleos)
+
+    Retorna un DataFrame indexado por métrica con estimate, lower, upper y std.
+    """
+    counts = np.array([tp, fp, tn, fn], dtype=float)
+    if counts.sum() <= 0:
+        raise ValueError("La matriz de confusión no tiene observaciones")
+
+    n_jobs = (os.cpu_count() or 1) if n_jobs in (None, -1) else max(1, n_jobs)
+    if n_jobs == 1 or n_boot < 2 * n_jobs:
+        replicates = _bootstrap_replicates(counts, n_boot, random_state)
+    else:
+        # Semillas independientes por proceso a partir de una sola semilla raíz
+        seeds = np.random.SeedSequence(random_state).spawn(n_jobs)
+        sizes = np.diff(np.linspace(0, n_boot, n_jobs + 1).astype(int))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            parts = list(executor.map(_bootstrap_replicates, [counts] * n_jobs, sizes, seeds))
+        replicates = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+    point = compute_metrics(tp=tp, fp=fp, tn=tn, fn=fn)
+    alpha = (1 - confidence) / 2
+    rows = []
+    for name in RATE_METRICS:
+        lower, upper = np.quantile(replicates[name], [alpha, 1 - alpha])
+        rows.append({
+            "metric": name,
+            "estimate": point[name],
+            "lower": float(lower),
+            "upper": float(upper),
+            "std": float(replicates[name].std(ddof=1)),
+        })
+    return pd.DataFrame(rows).set_index("metric")
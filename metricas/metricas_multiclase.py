@@ -0,0 +1,115 @@
+"""
+Métricas de clasificación multiclase a partir de una matriz de confusión K×K
+"""
+
+import numpy as np
+
+from .metricas_clasificacion import compute_metrics, compute_metrics_batch, safe_div
+
+# Métricas de tasa que se promedian (macro/weighted); los conteos solo tienen sentido por clase
+RATE_METRICS = (
+    "accuracy",
+    "precision",
+    "recall",
+    "specificity",
+    "f1",
+    "npv",
+    "fpr",
+    "fnr",
+    "prevalence",
+    "predicted_positive_rate",
+    "fdr",
+    "lift",
+)
+
+
+def multiclass_confusion_matrix(y_true, y_pred, labels=None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Construye la matriz de confusión K×K (filas = clase real, columnas = predicha).
+
+    Parámetros:
+      - y_true, y_pred: etiquetas reales y predichas
+      - labels: orden de las clases; por defecto, la unión ordenada de ambas
+
+    Retorna (matriz, labels). Las etiquetas que no están en labels se ignoran.
+    """
+    y_true = np.asarray(y_true).ravel()
+    y_pred = np.asarray(y_pred).ravel()
+    if y_true.shape != y_pred.shape:
+        raise ValueError(
+            f"y_true y y_pred deben tener el mismo tamaño ({y_true.size} != {y_pred.size})"
+        )
+
+    labels = np.unique(np.concatenate([y_true, y_pred])) if labels is None else np.asarray(labels)
+    k = len(labels)
+
+    # Índice de cada etiqueta en labels; -1 si no pertenece
+    order = np.argsort(labels, kind="stable")
+    sorted_labels = labels[order]
+
+    def _index(values):
+        pos = np.clip(np.searchsorted(sorted_labels, values), 0, k - 1)
+        return np.where(sorted_labels[pos] == values, order[pos], -1)
+
+    true_idx, pred_idx = _index(y_true), _index(y_pred)
+    valid = (true_idx >= 0) & (pred_idx >= 0)
+    cm = np.bincount(true_idx[valid] * k + pred_idx[valid], minlength=k * k).reshape(k, k)
+    return cm, labels
+
+
+def compute_multiclass_metrics(confusion_matrix, labels=None) -> dict:
+    """
+    Calcula métricas por clase, macro, micro y ponderadas de una matriz K×K.
+
+    Cada clase se evalúa como uno-contra-el-resto, obteniendo sus TP/FP/TN/FN de
+    la matriz en una sola pasada vectorizada:
+      - TP_k = M[k, k]
+      - FP_k = sum(M[:, k]) - TP_k
+      - FN_k = sum(M[k, :]) - TP_k
+      - TN_k = T - TP_k - FP_k - FN_k
+
+    Promedios:
+      - macro: media simple de las métricas por clase
+      - weighted: media ponderada por el soporte (TP_k + FN_k)
+      - micro: compute_metrics sobre la suma de los conteos de todas las clases
+
+    Retorna un diccionario con:
+      - labels, confusion_matrix, total, overall_accuracy (traza / T)
+      - per_class: métricas de compute_metrics como arreglos de K elementos
+      - macro, micro, weighted: diccionarios de métricas escalares
+    """
+    cm = np.asarray(confusion_matrix, dtype=float)
+    if cm.ndim != 2 or cm.shape[0] != cm.shape[1]:
+        raise ValueError("confusion_matrix debe ser una matriz cuadrada K×K")
+    k = cm.shape[0]
+    labels = np.arange(k) if labels is None else np.asarray(labels)
+    if len(labels) != k:
+        raise ValueError("labels debe tener un elemento por fila de la matriz")
+
+    total = cm.sum()
+    tp = np.diag(cm)
+    fp = cm.sum(axis=0) - tp
+    fn = cm.sum(axis=1) - tp
+    tn = total - tp - fp - fn
+
+    per_class = compute_metrics_batch(tp=tp, fp=fp, tn=tn, fn=fn)
+    support = tp + fn
+
+    macro = {name: float(per_class[name].mean()) for name in RATE_METRICS}
+    if support.sum() > 0:
+        weighted = {name: float(np.average(per_class[name], weights=support)) for name in RATE_METRICS}
+    else:
+        weighted = {name: 0.0 for name in RATE_METRICS}
+    micro = compute_metrics(tp=tp.sum(), fp=fp.sum(), tn=tn.sum(), fn=fn.sum())
+
+    return {
+        "labels": labels,
+        "confusion_matrix": cm,
+        "total": float(total),
+        "overall_accuracy": safe_div(float(tp.sum()), float(total)),
+        "support": support,
+        "per_class": per_class,
+        "macro": macro,
+        "micro": {name: float(micro[name]) for name in RATE_METRICS},
+        "weighted": weighted,
+    }
@@ -0,0 +1,94 @@
+"""
+Acumulador incremental de matrices de confusión binarias para flujos de predicciones
+"""
+
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from .metricas_clasificacion import compute_metrics
+
+
+class ConfusionAccumulator:
+    """
+    Acumula TP/FP/TN/FN a partir de bloques (y_true, y_pred) con estado O(1).
+
+    Permite evaluar registros de predicciones que no caben en memoria: cada
+    bloque se cuenta de forma vectorizada y se descarta. Acumuladores parciales
+    de distintos procesos se combinan con merge() o con el operador +.
+
+    Parámetros:
+      - positive_label: etiqueta de la clase positiva (por defecto 1)
+    """
+
+    def __init__(self, positive_label=1):
+        self.positive_label = positive_label
+        self.tp = 0
+        self.fp = 0
+        self.tn = 0
+        self.fn = 0
+
+    def update(self, y_true, y_pred) -> "ConfusionAccumulator":
+        """Agrega un bloque de etiquetas reales y predichas."""
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if y_true.shape != y_pred.shape:
+            raise ValueError(
+                f"y_true y y_pred deben tener el mismo tamaño ({y_true.size} != {y_pred.size})"
+            )
+
+        real_pos = y_true == self.positive_label
+        pred_pos = y_pred == self.positive_label
+
+        tp = int(np.count_nonzero(real_pos & pred_pos))
+        fp = int(np.count_nonzero(pred_pos)) - tp
+        fn = int(np.count_nonzero(real_pos)) - tp
+
+        self.tp += tp
+        self.fp += fp
+        self.fn += fn
+        self.tn += y_true.size - tp - fp - fn
+        return self
+
+    def update_from_stream(self, chunks: Iterable[Tuple[object, object]]) -> "ConfusionAccumulator":
+        """Consume un iterable/generador de bloques (y_true, y_pred)."""
+        for y_true, y_pred in chunks:
+            self.update(y_true, y_pred)
+        return self
+
+    @classmethod
+    def from_stream(cls, chunks: Iterable[Tuple[object, object]], positive_label=1) -> "ConfusionAccumulator":
+        """Crea un acumulador y consume el flujo completo."""
+        return cls(positive_label=positive_label).update_from_stream(chunks)
+
+    def merge(self, other: "ConfusionAccumulator") -> "ConfusionAccumulator":
+        """Suma en este acumulador los conteos de otro (p. ej. de otro proceso)."""
+        if other.positive_label != self.positive_label:
+            raise ValueError("No se pueden combinar acumuladores con distinta clase positiva")
+        self.tp += other.tp
+        self.fp += other.fp
+        self.tn += other.tn
+        self.fn += other.fn
+        return self
+
+    def __add__(self, other: "ConfusionAccumulator") -> "ConfusionAccumulator":
+        return ConfusionAccumulator(self.positive_label).merge(self).merge(other)
+
+    def __iadd__(self, other: "ConfusionAccumulator") -> "ConfusionAccumulator":
+        return self.merge(other)
+
+    @property
+    def total(self) -> int:
+        return self.tp + self.fp + self.tn + self.fn
+
+    def counts(self) -> dict[str, int]:
+        """Conteos actuales de la matriz de confusión."""
+        return {"tp": self.tp, "fp": self.fp, "tn": self.tn, "fn": self.fn}
+
+    def compute(self) -> dict[str, float]:
+        """Métricas de compute_metrics con los conteos acumulados hasta el momento."""
+        return compute_metrics(tp=self.tp, fp=self.fp, tn=self.tn, fn=self.fn)
+
+    def __repr__(self) -> str:
+        return (f"ConfusionAccumulator(tp={self.tp}, fp={self.fp}, "
+                f"tn={self.tn}, fn={self.fn}, positive_label={self.positive_label!r})")
@@ -0,0 +1,181 @@
+"""
+Salidas legibles por máquina (JSON, CSV, Markdown, Parquet) para los reportes de métricas
+"""
+
+import io
+import json
+from contextlib import redirect_stdout
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .metricas_clasificacion import as_percent, print_report
+
+# Etiquetas en el mismo orden que la tabla de print_report
+METRIC_LABELS = [
+    ("accuracy", "Exactitud (ACC)"),
+    ("recall", "Sensibilidad (SEN) / Recall / TPR"),
+    ("specificity", "Especificidad (SPE) / TNR"),
+    ("precision", "Precisión / Valor Predictivo Positivo (PPV)"),
+    ("npv", "Valor Predictivo Negativo (NPV)"),
+    ("fdr", "Tasa de descubrimiento falso (FDR)"),
+    ("fnr", "Tasa de falsos negativos (FNR)"),
+    ("fpr", "Tasa de falsos positivos (FPR)"),
+    ("lift", "Índice de elevación (Lift)"),
+    ("f1", "F1-Score"),
+]
+
+
+def _to_builtin(value):
+    """Convierte arreglos y escalares NumPy a tipos serializables en JSON."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient="records")
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def render_console(metrics: dict, as_table: bool = True) -> str:
+    """Texto de consola de print_report como cadena."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        print_report(metrics, as_table)
+    return buffer.getvalue()
+
+
+def render_json(metrics: dict, indent: int = 2) -> str:
+    """Diccionario de métricas como JSON (acepta también el reporte multiclase)."""
+    return json.dumps(metrics, default=_to_builtin, ensure_ascii=False, indent=indent)
+
+
+def render_csv(metrics: dict) -> str:
+    """Reporte binario como CSV de dos columnas: métrica, valor."""
+    frame = pd.DataFrame({"metric": list(metrics.keys()), "value": list(metrics.values())})
+    return frame.to_csv(index=False)
+
+
+def render_markdown(metrics: dict) -> str:
+    """Reporte binario como tabla Markdown con las mismas filas que print_report."""
+    lines = [
+        "| Conteo | Valor |",
+        "|---|---:|",
+        *(f"| {key.upper()} | {int(metrics[key])} |" for key in ("total", "tp", "fp", "tn", "fn")),
+        "",
+        "| Métrica | Valor |",
+        "|---|---:|",
+    ]
+    for key, label in METRIC_LABELS:
+        value = f"{metrics[key]:.3f}" if key == "lift" else as_percent(metrics[key])
+        lines.append(f"| {label} | {value} |")
+    return "\n".join(lines) + "\n"
+
+
+RENDERERS = {
+    "console": render_console,
+    "json": render_json,
+    "csv": render_csv,
+    "markdown": render_markdown,
+}
+
+
+def render_report(metrics: dict, fmt: str = "console", **kwargs) -> str:
+    """
+    Renderiza un diccionario de métricas en el formato indicado.
+
+    Parámetros:
+      - metrics: diccionario devuelto por compute_metrics
+      - fmt: "console", "json", "csv" o "markdown"
+    """
+    try:
+        renderer = RENDERERS[fmt]
+    except KeyError:
+        raise ValueError(f"Formato desconocido '{fmt}'. Opciones: {', '.join(RENDERERS)}") from None
+    return renderer(metrics, **kwargs)
+
+
+def reports_to_frame(reports: "Mapping[str, dict] | Iterable[dict]") -> pd.DataFrame:
+    """
+    Une muchos reportes de compute_metrics en un DataFrame (una fila por reporte).
+
+    Con un diccionario {nombre: métricas} el nombre queda en la columna "report".
+    """
+    if isinstance(reports, Mapping):
+        frame = pd.DataFrame.from_records(list(reports.values()))
+        frame.insert(0, "report", list(reports.keys()))
+        return frame
+    return pd.DataFrame.from_records(list(reports))
+
+
+def write_reports(reports: "Mapping[str, dict] | Iterable[dict]", path: str, fmt: str = None) -> pd.DataFrame:
+    """
+    Escribe miles de reportes en un solo archivo con una sola apertura.
+
+    Parámetros:
+      - reports: {nombre: métricas} o lista de diccionarios de compute_metrics
+      - path: archivo de salida
+      - fmt: "csv", "json" (JSON Lines), "markdown" o "parquet"; por defecto
+             se deduce de la extensión de path
+
+    Retorna el DataFrame escrito. Parquet requiere pyarrow o fastparquet.
+    """
+    frame = reports_to_frame(reports)
+    if fmt is None:
+        fmt = {"md": "markdown", "jsonl": "json", "pq": "parquet"}.get(
+            path.rsplit(".", 1)[-1].lower(), path.rsplit(".", 1)[-1].lower()
+        )
+
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+    elif fmt == "json":
+        frame.to_json(path, orient="records", lines=True, force_ascii=False)
+    elif fmt == "markdown":
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(frame.to_markdown(index=False))
+    elif fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Formato desconocido '{fmt}'. Opciones: csv, json, markdown, parquet")
+    return frame
+
+
+def summarize_reports(reports: "Mapping[str, dict] | Iterable[dict]") -> pd.DataFrame:
+    """
+    Media y desviación estándar de cada métrica sobre muchos reportes (p. ej. folds de CV).
+
+    Retorna un DataFrame con una fila por métrica y columnas "mean" y "std".
+    """
+    frame = reports_to_frame(reports).select_dtypes(include="number")
+    return frame.agg(["mean", "std"]).T
+
+
+def format_classification_report(report: dict, digits: int = 2) -> str:
+    """
+    Texto de sklearn.metrics.classification_report a partir de su versión output_dict=True.
+
+    Permite calcular el reporte una sola vez y usarlo tanto para imprimir como para guardar.
+    """
+    headers = ["precision", "recall", "f1-score", "support"]
+    width = max(len("weighted avg"), digits, *(len(str(name)) for name in report))
+    head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+    row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+
+    text = head_fmt.format("", *headers, width=width) + "\n\n"
+    averages = [name for name in report if name == "accuracy" or name.endswith(" avg")]
+    for name, values in report.items():
+        if name not in averages:
+            text += row_fmt.format(str(name), values["precision"], values["recall"], values["f1-score"],
+                                   int(values["support"]), width=width, digits=digits)
+    text += "\n"
+    for name in averages:
+        if name == "accuracy":
+            support = int(report["macro avg"]["support"]) if "macro avg" in report else ""
+            acc_fmt = "{:>{width}s} " + " {:>9}" * 2 + " {:>9.{digits}f}" + " {:>9}\n"
+            text += acc_fmt.format(name, "", "", report[name], support, width=width, digits=digits)
+        else:
+            values = report[name]
+            text += row_fmt.format(name, values["precision"], values["recall"], values["f1-score"],
+                                   int(values["support"]), width=width, digits=digits)
+    return text
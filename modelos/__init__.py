@@ -4,6 +4,7 @@ Paquete de modelos de machine learning para clasificación de enfermedades card
 
 from .random_forest_model import (
     entrenar_random_forest,
+    buscar_hiperparametros_random_forest,
     graficar_importancia_caracteristicas,
     graficar_matriz_confusion as rf_matriz_confusion
 )
@@ -15,12 +16,39 @@ from .logistic_regression_model import (
     comparar_regularizacion
 )
 
+from .persistencia import (
+    guardar_modelo,
+    cargar_modelo,
+    entrenar_o_cargar_modelo
+)
+
+from .validacion_cruzada import validacion_cruzada
+
+from .graficos import (
+    renderizar_figura,
+    renderizar_figuras
+)
+
+from .preprocesamiento import (
+    PreprocesadorCardiaco,
+    preprocesar_bloque
+)
+
 __all__ = [
     'entrenar_random_forest',
+    'buscar_hiperparametros_random_forest',
     'graficar_importancia_caracteristicas',
     'rf_matriz_confusion',
     'entrenar_logistic_regression',
     'graficar_coeficientes',
     'lr_matriz_confusion',
-    'comparar_regularizacion'
+    'comparar_regularizacion',
+    'guardar_modelo',
+    'cargar_modelo',
+    'entrenar_o_cargar_modelo',
+    'validacion_cruzada',
+    'renderizar_figura',
+    'renderizar_figuras',
+    'PreprocesadorCardiaco',
+    'preprocesar_bloque'
 ]
@@ -0,0 +1,117 @@
+"""
+Carga de datasets del UCI Machine Learning Repository con caché local en disco
+"""
+
+import json
+import os
+
+import pandas as pd
+
+DIRECTORIO_CACHE = os.environ.get("UCI_CACHE_DIR", "datos_cache")
+
+
+def _rutas_cache(id_dataset, directorio, version=None):
+    """Rutas del archivo de datos y de metadatos para un id (y versión opcional)."""
+    nombre = f"uci_{id_dataset}" + (f"_v{version}" if version else "")
+    return os.path.join(directorio, f"{nombre}.parquet"), os.path.join(directorio, f"{nombre}.json")
+
+
+def _buscar_cache(id_dataset, directorio, version=None):
+    """Retorna la ruta de metadatos en caché para el id/versión, o None si no existe."""
+    ruta_meta = _rutas_cache(id_dataset, directorio, version)[1]
+    if os.path.exists(ruta_meta):
+        return ruta_meta
+    if version is None and os.path.isdir(directorio):
+        # Sin versión pedida: usar la versión más reciente guardada de ese id
+        candidatos = [os.path.join(directorio, f) for f in os.listdir(directorio)
+                      if f.startswith(f"uci_{id_dataset}_v") and f.endswith(".json")]
+        if candidatos:
+            return max(candidatos, key=os.path.getmtime)
+    return None
+
+
+def _leer_cache(ruta_meta):
+    """Lee datos y metadatos de la caché y separa características y objetivo."""
+    with open(ruta_meta, encoding="utf-8") as f:
+        meta = json.load(f)
+    ruta_datos = os.path.join(os.path.dirname(ruta_meta), meta["archivo"])
+    if ruta_datos.endswith(".parquet"):
+        df = pd.read_parquet(ruta_datos)
+    else:
+        df = pd.read_pickle(ruta_datos)
+    return df[meta["features"]], df[meta["targets"]]
+
+
+def _guardar_cache(X, y, id_dataset, directorio, version=None):
+    """Guarda características y objetivo en un solo archivo Parquet (o pickle sin pyarrow)."""
+    os.makedirs(directorio, exist_ok=True)
+    ruta_datos, ruta_meta = _rutas_cache(id_dataset, directorio, version)
+    df = pd.concat([X, y], axis=1)
+    try:
+        df.to_parquet(ruta_datos, index=False)
+    except ImportError:
+        ruta_datos = ruta_datos.replace(".parquet", ".pkl")
+        df.to_pickle(ruta_datos)
+
+    meta = {
+        "id": id_dataset,
+        "version": version,
+        "archivo": os.path.basename(ruta_datos),
+        "features": list(X.columns),
+        "targets": list(y.columns),
+    }
+    with open(ruta_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def cargar_dataset_uci(id_dataset, directorio=DIRECTORIO_CACHE, archivo_local=None,
+                       columnas_objetivo=None, version=None, forzar_descarga=False):
+    """
+    Carga un dataset de UCI, descargándolo solo si no está en la caché local
+
+    Orden de búsqueda:
+    1. archivo_local (CSV o Parquet incluido con el proyecto), si se indica
+    2. caché en disco, clave = id del dataset y versión
+    3. descarga con ucimlrepo.fetch_ucirepo (requiere red) y guardado en caché
+
+    Parámetros:
+    - id_dataset: Id del dataset en UCI (45 = Heart Disease)
+    - directorio: Carpeta de la caché (variable de entorno UCI_CACHE_DIR)
+    - archivo_local: Archivo con características y objetivo en columnas
+    - columnas_objetivo: Columnas objetivo de archivo_local (por defecto ['num'])
+    - version: Versión a usar; None = la más reciente en caché o la publicada
+    - forzar_descarga: Ignorar la caché y volver a descargar
+
+    Retorna:
+    - X: DataFrame de características
+    - y: DataFrame de variables objetivo
+    """
+    if archivo_local is not None:
+        if archivo_local.endswith((".parquet", ".pq")):
+            df = pd.read_parquet(archivo_local)
+        else:
+            df = pd.read_csv(archivo_local, na_values=["?"])
+        columnas_objetivo = columnas_objetivo or ["num"]
+        return df.drop(columns=columnas_objetivo), df[columnas_objetivo]
+
+    if not forzar_descarga:
+        ruta_meta = _buscar_cache(id_dataset, directorio, version)
+        if ruta_meta is not None:
+            return _leer_cache(ruta_meta)
+
+    try:
+        from ucimlrepo import fetch_ucirepo
+    except ImportError as e:
+        raise RuntimeError(
+            f"El dataset {id_dataset} no está en la caché '{directorio}' y ucimlrepo no está instalado"
+        ) from e
+
+    dataset = fetch_ucirepo(id=id_dataset)
+    if version is None:
+        version = str(getattr(dataset.metadata, "last_updated", None) or "") or None
+        if version:
+            version = "".join(c if c.isalnum() else "-" for c in version)
+
+    X, y = dataset.data.features, dataset.data.targets
+    _guardar_cache(X, y, id_dataset, directorio, version)
+    return X, y
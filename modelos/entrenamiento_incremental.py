@@ -0,0 +1,212 @@
+"""
+Entrenamiento fuera de memoria (out-of-core) para datasets más grandes que la RAM
+
+Los datos se leen por bloques (CSV/Parquet o cualquier generador de DataFrames);
+la memoria queda acotada por el tamaño del bloque:
+- Regresión logística con SGD (partial_fit) y estandarización incremental
+  (StandardScaler.partial_fit) en lugar de StandardScaler.fit_transform.
+- Bosque aleatorio por bloques: un sub-bosque por bloque, combinados en un solo
+  RandomForestClassifier compatible con predict/predict_proba y con puntuacion.py.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from metricas import ConfusionAccumulator
+
+from .preprocesamiento import PreprocesadorCardiaco, COLUMNA_OBJETIVO
+from .puntuacion import TAMANO_BLOQUE, leer_bloques
+from .random_forest_model import _crear_random_forest
+
+CLASES = np.array([0, 1])
+
+
+def _iterar_bloques(fuente, tamano_bloque):
+    """Bloques de DataFrame desde una ruta (.csv/.parquet) o un callable que retorna un iterable."""
+    if callable(fuente):
+        return iter(fuente())
+    return leer_bloques(fuente, tamano_bloque)
+
+
+def _bloques_preprocesados(fuente, preprocesador, tamano_bloque):
+    """Generador de (X DataFrame, y arreglo) ya preprocesados; ajusta el preprocesador con el primer bloque si no lo está."""
+    for bloque in _iterar_bloques(fuente, tamano_bloque):
+        if not preprocesador.ajustado:
+            preprocesador.fit(bloque)
+        X = preprocesador.transform(bloque)
+        y = preprocesador.transformar_objetivo(bloque[COLUMNA_OBJETIVO]).to_numpy()
+        yield X, y
+
+
+def _evaluar_por_bloques(modelo, fuente_prueba, preprocesador, tamano_bloque, scaler=None):
+    """Métricas de compute_metrics sobre un conjunto de prueba leído por bloques."""
+    acumulador = ConfusionAccumulator()
+    for X, y in _bloques_preprocesados(fuente_prueba, preprocesador, tamano_bloque):
+        if scaler is not None:
+            X = scaler.transform(X)
+        acumulador.update(y, modelo.predict(X))
+    return acumulador.compute()
+
+
+def entrenar_logistic_regression_incremental(fuente, fuente_prueba=None, C=1.0, n_epocas=5,
+                                             tamano_bloque=TAMANO_BLOQUE, preprocesador=None,
+                                             random_state=42):
+    """
+    Entrena una Regresión Logística regularizada fuera de memoria (SGD con partial_fit)
+
+    Primera pasada: estadísticas del escalador con StandardScaler.partial_fit.
+    Pasadas siguientes (n_epocas): SGDClassifier(loss='log_loss') con partial_fit sobre
+    cada bloque estandarizado y barajado (SGD promediado). La penalización L2 equivale a la de
+    LogisticRegression con alpha = 1 / (C x filas).
+
+    Parámetros:
+    - fuente: Ruta .csv/.parquet o callable que retorna un iterable de DataFrames con
+      las características y la columna 'num' (se lee una vez por época)
+    - fuente_prueba: Igual que fuente, para evaluar (opcional)
+    - C: Parámetro de regularización (como en entrenar_logistic_regression)
+    - n_epocas: Pasadas completas sobre los datos
+    - tamano_bloque: Filas por bloque al leer archivos
+    - preprocesador: PreprocesadorCardiaco ajustado; si no se indica, las medianas se
+      calculan con el primer bloque
+    - random_state: Semilla para reproducibilidad
+
+    Retorna:
+    - modelo: SGDClassifier entrenado (predict_proba disponible)
+    - scaler: StandardScaler ajustado de forma incremental
+    - metricas: Diccionario con filas, coeficientes, preprocesador usado y métricas de
+      prueba (compute_metrics)
+    """
+    print("=" * 60)
+    print("ENTRENANDO REGRESIÓN LOGÍSTICA FUERA DE MEMORIA (SGD)")
+    print("=" * 60)
+
+    preprocesador = preprocesador or PreprocesadorCardiaco()
+    rng = np.random.default_rng(random_state)
+
+    # Pasada 1: media y varianza incrementales
+    scaler = StandardScaler()
+    for X, _ in _bloques_preprocesados(fuente, preprocesador, tamano_bloque):
+        scaler.partial_fit(X)
+    filas = int(np.max(scaler.n_samples_seen_))
+    print(f"Escalador ajustado con {filas} filas")
+
+    # average=True (SGD promediado) converge a la solución de LogisticRegression
+    # en pocas épocas aunque el paso de aprendizaje sea grande al inicio
+    lr_model = SGDClassifier(loss='log_loss', penalty='l2', alpha=1.0 / (C * filas),
+                             average=True, random_state=random_state)
+    for epoca in range(n_epocas):
+        for X, y in _bloques_preprocesados(fuente, preprocesador, tamano_bloque):
+            orden = rng.permutation(len(y))
+            lr_model.partial_fit(scaler.transform(X.iloc[orden]), y[orden], classes=CLASES)
+        print(f"Época {epoca + 1}/{n_epocas} completada")
+
+    feature_coef = pd.DataFrame({
+        'caracteristica': preprocesador.caracteristicas,
+        'coeficiente': lr_model.coef_[0]
+    }).sort_values('coeficiente', key=abs, ascending=False)
+
+    metricas = {
+        'filas_entrenamiento': filas,
+        'feature_coefficients': feature_coef,
+        'intercept': lr_model.intercept_[0],
+        'preprocesador': preprocesador,
+        'metricas_prueba': None,
+    }
+    if fuente_prueba is not None:
+        metricas['metricas_prueba'] = _evaluar_por_bloques(lr_model, fuente_prueba, preprocesador,
+                                                           tamano_bloque, scaler)
+        print(f"Precisión en prueba: {metricas['metricas_prueba']['accuracy']:.4f}")
+
+    return lr_model, scaler, metricas
+
+
+def combinar_bosques(bosques):
+    """
+    Combina sub-bosques entrenados con las mismas clases y columnas en un solo bosque
+
+    El resultado promedia las probabilidades de todos los árboles, igual que un
+    RandomForestClassifier entrenado con todos ellos.
+    """
+    if not bosques:
+        raise ValueError("No hay sub-bosques para combinar")
+    combinado = copy.copy(bosques[0])
+    combinado.estimators_ = []
+    for bosque in bosques:
+        if not np.array_equal(bosque.classes_, combinado.classes_):
+            raise ValueError(f"Clases distintas entre sub-bosques: {bosque.classes_} != {combinado.classes_}")
+        combinado.estimators_.extend(bosque.estimators_)
+    combinado.n_estimators = len(combinado.estimators_)
+    return combinado
+
+
+def entrenar_random_forest_por_bloques(fuente, fuente_prueba=None, n_estimators_por_bloque=10,
+                                       tamano_bloque=TAMANO_BLOQUE, max_bloques=None, preprocesador=None,
+                                       random_state=42, max_depth=10, min_samples_split=5,
+                                       min_samples_leaf=2, n_jobs=None):
+    """
+    Entrena un Random Forest fuera de memoria: un sub-bosque por bloque, combinados al final
+
+    Solo un bloque de datos está en memoria a la vez; el modelo final tiene
+    n_estimators_por_bloque x bloques árboles.
+
+    Parámetros:
+    - fuente: Ruta .csv/.parquet o callable que retorna un iterable de DataFrames con 'num'
+    - fuente_prueba: Igual que fuente, para evaluar (opcional)
+    - n_estimators_por_bloque: Árboles por sub-bosque
+    - tamano_bloque: Filas por bloque al leer archivos
+    - max_bloques: Límite de bloques a usar (None = todos)
+    - preprocesador: PreprocesadorCardiaco ajustado (si no, medianas del primer bloque)
+    - random_state, max_depth, min_samples_split, min_samples_leaf, n_jobs: Como en
+      entrenar_random_forest; cada sub-bosque usa random_state + número de bloque
+
+    Retorna:
+    - modelo: RandomForestClassifier combinado
+    - metricas: Diccionario con filas, bloques, importancia, preprocesador usado y
+      métricas de prueba (compute_metrics)
+    """
+    print("=" * 60)
+    print("ENTRENANDO RANDOM FOREST POR BLOQUES (FUERA DE MEMORIA)")
+    print("=" * 60)
+
+    preprocesador = preprocesador or PreprocesadorCardiaco()
+    bosques, filas, omitidos = [], 0, 0
+    for i, (X, y) in enumerate(_bloques_preprocesados(fuente, preprocesador, tamano_bloque)):
+        if max_bloques is not None and i >= max_bloques:
+            break
+        if len(np.unique(y)) < len(CLASES):
+            # Un sub-bosque de una sola clase no se puede combinar con los demás
+            omitidos += 1
+            continue
+        bosque = _crear_random_forest(n_estimators_por_bloque, random_state + i, max_depth,
+                                      min_samples_split, min_samples_leaf, n_jobs)
+        bosque.fit(X, y)
+        bosques.append(bosque)
+        filas += len(y)
+        print(f"Bloque {i + 1}: {len(y)} filas -> {n_estimators_por_bloque} árboles")
+
+    rf_model = combinar_bosques(bosques)
+    if omitidos:
+        print(f"Bloques omitidos por tener una sola clase: {omitidos}")
+    print(f"Bosque combinado: {rf_model.n_estimators} árboles de {len(bosques)} bloques ({filas} filas)")
+
+    feature_importance = pd.DataFrame({
+        'caracteristica': preprocesador.caracteristicas,
+        'importancia': rf_model.feature_importances_
+    }).sort_values('importancia', ascending=False)
+
+    metricas = {
+        'filas_entrenamiento': filas,
+        'bloques': len(bosques),
+        'feature_importance': feature_importance,
+        'preprocesador': preprocesador,
+        'metricas_prueba': None,
+    }
+    if fuente_prueba is not None:
+        metricas['metricas_prueba'] = _evaluar_por_bloques(rf_model, fuente_prueba, preprocesador, tamano_bloque)
+        print(f"Precisión en prueba: {metricas['metricas_prueba']['accuracy']:.4f}")
+
+    return rf_model, metricas
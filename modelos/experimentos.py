@@ -0,0 +1,231 @@
+"""
+Ejecución desatendida de lotes de experimentos (modelo, hiperparámetros, semillas)
+
+Uso:
+    python -m modelos.experimentos experimentos.json --salida resultados_experimentos --n-jobs -1
+
+Formato del archivo de experimentos (JSON, lista de declaraciones):
+    [
+        {"nombre": "rf_base", "modelo": "random_forest",
+         "hiperparametros": {"n_estimators": 200}, "semillas": [1, 2, 3]},
+        {"nombre": "lr_C", "modelo": "logistic_regression",
+         "grilla": {"C": [0.01, 0.1, 1.0, 10.0]}, "semillas": [42]}
+    ]
+
+Cada combinación (hiperparámetros x semilla) es una corrida independiente que se
+ejecuta en un proceso trabajador; sus métricas, figuras y salida de consola se
+escriben en una carpeta propia y el resumen de todas queda en resumen.csv.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+from sklearn.metrics import confusion_matrix
+from sklearn.model_selection import ParameterGrid
+
+from metricas import compute_metrics, render_report, write_reports
+
+from .persistencia import ENTRENADORES
+from .preprocesamiento import PreprocesadorCardiaco
+from .random_forest_model import (
+    _repartir_nucleos,
+    graficar_importancia_caracteristicas,
+    graficar_matriz_confusion as rf_matriz_confusion
+)
+from .logistic_regression_model import (
+    graficar_coeficientes,
+    graficar_matriz_confusion as lr_matriz_confusion
+)
+
+DIRECTORIO_RESULTADOS = "resultados_experimentos"
+
+# Datos compartidos, copiados una sola vez por proceso trabajador
+_DATOS = None
+
+
+def cargar_experimentos(ruta):
+    """Lee la lista de declaraciones de experimentos desde un archivo JSON."""
+    with open(ruta, encoding="utf-8") as f:
+        declaraciones = json.load(f)
+    if isinstance(declaraciones, dict):
+        declaraciones = declaraciones.get("experimentos", [declaraciones])
+    return declaraciones
+
+
+def expandir_experimentos(declaraciones):
+    """
+    Expande las declaraciones en corridas individuales
+
+    Cada declaración admite:
+    - nombre: Identificador (por defecto el tipo de modelo)
+    - modelo: 'random_forest' o 'logistic_regression'
+    - hiperparametros: Argumentos fijos para la función de entrenamiento
+    - grilla: {hiperparámetro: [valores]}; se evalúa el producto cartesiano
+    - semillas: Semillas de división train/test y del modelo (por defecto [42])
+
+    Retorna:
+    - Lista de diccionarios con id, nombre, modelo, hiperparametros y semilla
+    """
+    corridas = []
+    for declaracion in declaraciones:
+        modelo = declaracion["modelo"]
+        if modelo not in ENTRENADORES:
+            raise ValueError(f"Tipo de modelo desconocido '{modelo}'. Opciones: {', '.join(ENTRENADORES)}")
+        nombre = declaracion.get("nombre", modelo)
+        fijos = dict(declaracion.get("hiperparametros", {}))
+        grilla = ParameterGrid(declaracion["grilla"]) if declaracion.get("grilla") else [{}]
+        for combinacion in grilla:
+            for semilla in declaracion.get("semillas", [42]):
+                corridas.append({
+                    "id": f"{len(corridas):04d}_{nombre}_s{semilla}",
+                    "nombre": nombre,
+                    "modelo": modelo,
+                    "hiperparametros": {**fijos, **combinacion},
+                    "semilla": semilla,
+                })
+    return corridas
+
+
+def _guardar_figuras(modelo, metricas, y_test, carpeta, formato='png'):
+    """Guarda las figuras del modelo en archivos (figuras Agg reutilizadas, sin ventanas)."""
+    if modelo == "random_forest":
+        graficar_importancia_caracteristicas(metricas, top_n=10,
+                                             ruta=os.path.join(carpeta, f"importancia.{formato}"))
+        rf_matriz_confusion(y_test, metricas["y_pred_test"],
+                            ruta=os.path.join(carpeta, f"matriz_confusion.{formato}"))
+    else:
+        graficar_coeficientes(metricas, top_n=10, ruta=os.path.join(carpeta, f"coeficientes.{formato}"))
+        lr_matriz_confusion(y_test, metricas["y_pred_test"],
+                            ruta=os.path.join(carpeta, f"matriz_confusion.{formato}"))
+
+
+def ejecutar_corrida(corrida, X, y, preprocesador, directorio, figuras='png', hilos_por_modelo=1):
+    """
+    Ejecuta una corrida: divide los datos con su semilla, entrena, evalúa y guarda resultados
+
+    Retorna:
+    - Diccionario (fila del resumen) con la corrida, sus métricas de compute_metrics y la duración;
+      si la corrida falla, la fila incluye el error en lugar de detener el lote
+    """
+    carpeta = os.path.join(directorio, corrida["id"])
+    os.makedirs(carpeta, exist_ok=True)
+    hiperparametros = dict(corrida["hiperparametros"])
+    hiperparametros.setdefault("random_state", corrida["semilla"])
+    if corrida["modelo"] == "random_forest":
+        hiperparametros.setdefault("n_jobs", hilos_por_modelo)
+
+    fila = {"id": corrida["id"], "nombre": corrida["nombre"], "modelo": corrida["modelo"],
+            "semilla": corrida["semilla"], "hiperparametros": json.dumps(corrida["hiperparametros"],
+                                                                         sort_keys=True)}
+    inicio = time.perf_counter()
+    try:
+        with open(os.path.join(carpeta, "log.txt"), "w", encoding="utf-8") as log, redirect_stdout(log):
+            X_train, X_test, y_train, y_test = preprocesador.dividir(X, y, random_state=corrida["semilla"])
+            resultado = ENTRENADORES[corrida["modelo"]](X_train, X_test, y_train, y_test, **hiperparametros)
+            metricas_modelo = resultado[-1]
+
+            tn, fp, fn, tp = confusion_matrix(y_test, metricas_modelo["y_pred_test"], labels=[0, 1]).ravel()
+            resultados = compute_metrics(tp=tp, fp=fp, tn=tn, fn=fn)
+            with open(os.path.join(carpeta, "metricas.json"), "w", encoding="utf-8") as f:
+                f.write(render_report(resultados, "json"))
+            if figuras:
+                _guardar_figuras(corrida["modelo"], metricas_modelo, y_test, carpeta, figuras)
+
+        fila.update(accuracy_train=metricas_modelo["accuracy_train"], **resultados)
+    except Exception as e:
+        fila["error"] = f"{type(e).__name__}: {e}"
+    fila["duracion_s"] = time.perf_counter() - inicio
+    return fila
+
+
+def _inicializar_trabajador(X, y, preprocesador):
+    """Recibe los datos una vez por proceso."""
+    global _DATOS
+    _DATOS = (X, y, preprocesador)
+
+
+def _ejecutar_corrida_trabajador(corrida, directorio, figuras, hilos_por_modelo):
+    return ejecutar_corrida(corrida, *_DATOS, directorio, figuras, hilos_por_modelo)
+
+
+def ejecutar_experimentos(declaraciones, X, y, preprocesador=None, directorio=DIRECTORIO_RESULTADOS,
+                          n_jobs=-1, figuras='png'):
+    """
+    Ejecuta un lote de experimentos en procesos paralelos sin interacción del usuario
+
+    Parámetros:
+    - declaraciones: Lista de experimentos (ver expandir_experimentos) o ruta a un JSON
+    - X, y: Características y objetivo crudos (como los devuelve cargar_dataset_uci)
+    - preprocesador: PreprocesadorCardiaco ajustado (por defecto se ajusta sobre X)
+    - directorio: Carpeta de salida (una subcarpeta por corrida y resumen.csv)
+    - n_jobs: Procesos en paralelo (-1 = todos los núcleos)
+    - figuras: Formato de las figuras de cada corrida ('png' o 'svg'); None = no guardarlas
+
+    Retorna:
+    - DataFrame resumen con una fila por corrida, ordenado por id
+    """
+    if isinstance(declaraciones, str):
+        declaraciones = cargar_experimentos(declaraciones)
+    corridas = expandir_experimentos(declaraciones)
+    if preprocesador is None:
+        preprocesador = PreprocesadorCardiaco().fit(X)
+    os.makedirs(directorio, exist_ok=True)
+
+    # Procesos x hilos por bosque sin superar los núcleos disponibles
+    procesos, hilos_por_modelo = _repartir_nucleos(len(corridas), n_jobs)
+    print(f"Ejecutando {len(corridas)} corridas con {procesos} procesos x {hilos_por_modelo} hilos")
+
+    filas = []
+    inicio = time.perf_counter()
+    if procesos == 1:
+        for corrida in corridas:
+            filas.append(ejecutar_corrida(corrida, X, y, preprocesador, directorio, figuras, hilos_por_modelo))
+            print(f"[{len(filas)}/{len(corridas)}] {corrida['id']}")
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                                 initargs=(X, y, preprocesador)) as executor:
+            futuros = [executor.submit(_ejecutar_corrida_trabajador, corrida, directorio, figuras,
+                                       hilos_por_modelo) for corrida in corridas]
+            for futuro in as_completed(futuros):
+                filas.append(futuro.result())
+                print(f"[{len(filas)}/{len(corridas)}] {filas[-1]['id']}")
+
+    filas.sort(key=lambda fila: fila["id"])
+    resumen = write_reports(filas, os.path.join(directorio, "resumen.csv"))
+    fallidas = int(resumen["error"].notna().sum()) if "error" in resumen else 0
+    print(f"\n{len(filas)} corridas en {time.perf_counter() - inicio:.1f} s "
+          f"({fallidas} con error) -> {os.path.join(directorio, 'resumen.csv')}")
+    return resumen
+
+
+def resumir_por_experimento(resumen, metricas=("accuracy", "recall", "precision", "f1")):
+    """Media y desviación estándar de las métricas por experimento e hiperparámetros (entre semillas)."""
+    columnas = [m for m in metricas if m in resumen]
+    return resumen.groupby(["nombre", "modelo", "hiperparametros"])[columnas].agg(["mean", "std"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lote de experimentos de predicción de supervivencia")
+    parser.add_argument("experimentos", help="archivo JSON con la lista de experimentos")
+    parser.add_argument("--salida", default=DIRECTORIO_RESULTADOS, help="carpeta de resultados")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="procesos en paralelo (-1 = todos)")
+    parser.add_argument("--figuras", choices=["png", "svg"], default="png", help="formato de las figuras")
+    parser.add_argument("--sin-figuras", action="store_true", help="no guardar figuras")
+    parser.add_argument("--datos", default=None, help="archivo CSV/Parquet local en lugar de UCI")
+    args = parser.parse_args(argv)
+
+    from .datos import cargar_dataset_uci
+    X, y = cargar_dataset_uci(45, archivo_local=args.datos)
+    resumen = ejecutar_experimentos(args.experimentos, X, y, directorio=args.salida,
+                                    n_jobs=args.n_jobs, figuras=None if args.sin_figuras else args.figuras)
+    print()
+    print(resumir_por_experimento(resumen).to_string())
+    return resumen
+
+
+if __name__ == "__main__":
+    main()
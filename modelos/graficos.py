@@ -0,0 +1,102 @@
+"""
+Renderizado de figuras a archivos (PNG/SVG) sin ventanas y en paralelo
+
+Las funciones graficar_* de los modelos aceptan ruta=...: en ese modo dibujan en
+una figura Agg reutilizada (sin pyplot ni plt.show()) y la guardan en disco, por
+lo que funcionan en servidores sin pantalla. renderizar_figuras reparte muchas
+figuras entre procesos; cada proceso reutiliza sus propias figuras.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+FORMATOS = ('png', 'svg')
+
+# Figuras reutilizables por proceso: {(clave, figsize): Figure}
+_FIGURAS = {}
+
+
+def obtener_figura(clave, figsize):
+    """
+    Retorna una figura Agg vacía para la clave, creándola solo la primera vez
+
+    La figura no se registra en pyplot (no abre ventanas ni acumula memoria);
+    cada llamada la limpia y la reutiliza en lugar de crear una nueva.
+    """
+    figura = _FIGURAS.get((clave, figsize))
+    if figura is None:
+        figura = Figure(figsize=figsize)
+        FigureCanvasAgg(figura)
+        _FIGURAS[(clave, figsize)] = figura
+    else:
+        figura.clear()
+    return figura
+
+
+def guardar_figura(figura, ruta, dpi=100):
+    """Guarda la figura en ruta; el formato (png o svg) se deduce de la extensión."""
+    formato = os.path.splitext(ruta)[1].lstrip('.').lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de figura no soportado: '{formato}' (use .png o .svg)")
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    figura.tight_layout()
+    figura.savefig(ruta, format=formato, dpi=dpi)
+    return ruta
+
+
+def _funciones():
+    """Funciones de graficado por nombre (importadas aquí para evitar importaciones circulares)."""
+    from .random_forest_model import graficar_importancia_caracteristicas, graficar_matriz_confusion as rf_matriz
+    from .logistic_regression_model import graficar_coeficientes, graficar_matriz_confusion as lr_matriz
+    return {
+        'importancia_rf': graficar_importancia_caracteristicas,
+        'matriz_confusion_rf': rf_matriz,
+        'coeficientes_lr': graficar_coeficientes,
+        'matriz_confusion_lr': lr_matriz,
+    }
+
+
+def renderizar_figura(tipo, ruta, **argumentos):
+    """
+    Renderiza una figura a archivo por nombre
+
+    Parámetros:
+    - tipo: 'importancia_rf', 'matriz_confusion_rf', 'coeficientes_lr' o 'matriz_confusion_lr'
+    - ruta: Archivo .png o .svg de salida
+    - argumentos: Argumentos de la función de graficado (metricas, y_test, y_pred, ...)
+    """
+    funciones = _funciones()
+    if tipo not in funciones:
+        raise ValueError(f"Tipo de figura desconocido '{tipo}'. Opciones: {', '.join(funciones)}")
+    return funciones[tipo](ruta=ruta, **argumentos)
+
+
+def _renderizar_tarea(tarea):
+    tipo, ruta, argumentos = tarea
+    return renderizar_figura(tipo, ruta, **argumentos)
+
+
+def renderizar_figuras(tareas, n_jobs=-1):
+    """
+    Renderiza muchas figuras a archivo en un pool de procesos
+
+    Parámetros:
+    - tareas: Lista de tuplas (tipo, ruta, argumentos) para renderizar_figura
+    - n_jobs: Procesos en paralelo (-1 = todos los núcleos)
+
+    Retorna:
+    - Lista de rutas escritas, en el orden de las tareas
+    """
+    tareas = list(tareas)
+    n_jobs = (os.cpu_count() or 1) if n_jobs in (None, -1) else max(1, n_jobs)
+    n_jobs = min(n_jobs, len(tareas)) or 1
+    if n_jobs == 1:
+        return [_renderizar_tarea(tarea) for tarea in tareas]
+
+    # Bloques de tareas por proceso para reutilizar sus figuras y reducir la comunicación
+    chunksize = max(1, len(tareas) // (4 * n_jobs))
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(_renderizar_tarea, tareas, chunksize=chunksize))
@@ -4,12 +4,27 @@ Modelo de Regresión Logística Regularizada para clasificación de enfermedades
 
 import pandas as pd
 import numpy as np
+from joblib import Parallel, delayed
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from metricas import format_classification_report
+
+from .graficos import obtener_figura, guardar_figura
+
+
+def _crear_logistic_regression(C=1.0, random_state=42):
+    """Modelo con la configuración de entrenar_logistic_regression (compartido con la validación cruzada)."""
+    return LogisticRegression(
+        C=C,
+        random_state=random_state,
+        max_iter=1000,
+        solver='liblinear'  # Bueno para datasets pequeños
+    )
+
 
 def entrenar_logistic_regression(X_train, X_test, y_train, y_test, C=1.0, random_state=42):
     """
@@ -42,12 +57,7 @@ def entrenar_logistic_regression(X_train, X_test, y_train, y_test, C=1.0, random
     print(f"Parámetro de regularización C = {C}")
     
     # Crear y entrenar el modelo
-    lr_model = LogisticRegression(
-        C=C,
-        random_state=random_state,
-        max_iter=1000,
-        solver='liblinear'  # Bueno para datasets pequeños
-    )
+    lr_model = _crear_logistic_regression(C, random_state)
     
     print("Entrenando Regresión Logística...")
     lr_model.fit(X_train_scaled, y_train)
@@ -63,10 +73,11 @@ def entrenar_logistic_regression(X_train, X_test, y_train, y_test, C=1.0, random
     print(f"\nPrecisión en entrenamiento: {accuracy_train:.4f}")
     print(f"Precisión en prueba: {accuracy_test:.4f}")
     
-    # Crear reporte de clasificación
+    # Crear reporte de clasificación (se calcula una sola vez para imprimir y guardar)
+    reporte = classification_report(y_test, y_pred_test, output_dict=True)
     print("\nReporte de Clasificación (Conjunto de Prueba):")
     print("-" * 50)
-    print(classification_report(y_test, y_pred_test))
+    print(format_classification_report(reporte))
     
     # Mostrar coeficientes de las características
     feature_coef = pd.DataFrame({
@@ -82,7 +93,7 @@ def entrenar_logistic_regression(X_train, X_test, y_train, y_test, C=1.0, random
     metricas = {
         'accuracy_train': accuracy_train,
         'accuracy_test': accuracy_test,
-        'classification_report': classification_report(y_test, y_pred_test, output_dict=True),
+        'classification_report': reporte,
         'feature_coefficients': feature_coef,
         'y_pred_test': y_pred_test,
         'intercept': lr_model.intercept_[0]
@@ -91,71 +102,123 @@ def entrenar_logistic_regression(X_train, X_test, y_train, y_test, C=1.0, random
     return lr_model, scaler, metricas
 
 
-def graficar_coeficientes(metricas, top_n=10):
+def graficar_coeficientes(metricas, top_n=10, ruta=None):
     """
     Grafica los coeficientes de las características más importantes
+
+    Con ruta (.png o .svg) la figura se guarda en archivo sin mostrarse (ver modelos.graficos)
     """
-    plt.figure(figsize=(12, 6))
+    fig = obtener_figura('coeficientes_lr', (12, 6)) if ruta else plt.figure(figsize=(12, 6))
+    ax = fig.add_subplot()
     top_features = metricas['feature_coefficients'].head(top_n)
     
     colors = ['red' if x < 0 else 'blue' for x in top_features['coeficiente']]
-    plt.barh(range(len(top_features)), top_features['coeficiente'], color=colors)
-    plt.yticks(range(len(top_features)), top_features['caracteristica'])
-    plt.xlabel('Valor del Coeficiente')
-    plt.title(f'Top {top_n} Coeficientes de Características - Regresión Logística')
-    plt.axvline(x=0, color='black', linestyle='--', alpha=0.5)
-    plt.gca().invert_yaxis()
-    plt.tight_layout()
+    ax.barh(range(len(top_features)), top_features['coeficiente'], color=colors)
+    ax.set_yticks(range(len(top_features)), top_features['caracteristica'])
+    ax.set_xlabel('Valor del Coeficiente')
+    ax.set_title(f'Top {top_n} Coeficientes de Características - Regresión Logística')
+    ax.axvline(x=0, color='black', linestyle='--', alpha=0.5)
+    ax.invert_yaxis()
+    if ruta:
+        return guardar_figura(fig, ruta)
+    fig.tight_layout()
     plt.show()
 
 
-def graficar_matriz_confusion(y_test, y_pred, titulo="Matriz de Confusión - Regresión Logística"):
+def graficar_matriz_confusion(y_test, y_pred, titulo="Matriz de Confusión - Regresión Logística", ruta=None):
     """
     Grafica la matriz de confusión
+
+    Con ruta (.png o .svg) la figura se guarda en archivo sin mostrarse (ver modelos.graficos)
     """
-    plt.figure(figsize=(8, 6))
+    fig = obtener_figura('matriz_confusion', (8, 6)) if ruta else plt.figure(figsize=(8, 6))
+    ax = fig.add_subplot()
     cm = confusion_matrix(y_test, y_pred)
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Reds', 
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Reds', ax=ax,
                 xticklabels=['Vive', 'Muere'],
                 yticklabels=['Vive', 'Muere'])
-    plt.title(titulo)
-    plt.ylabel('Valor Real')
-    plt.xlabel('Valor Predicho')
-    plt.tight_layout()
+    ax.set_title(titulo)
+    ax.set_ylabel('Valor Real')
+    ax.set_xlabel('Valor Predicho')
+    if ruta:
+        return guardar_figura(fig, ruta)
+    fig.tight_layout()
     plt.show()
 
 
-def comparar_regularizacion(X_train, X_test, y_train, y_test, C_values=[0.01, 0.1, 1.0, 10.0, 100.0]):
+def _ajustar_regularizacion(C, X_train_scaled, X_test_scaled, y_train, y_test):
+    """
+    Ajusta y evalúa un modelo independiente para un valor de C (modo sin warm start)
+    """
+    lr_model = LogisticRegression(C=C, random_state=42, max_iter=1000, solver='liblinear')
+    lr_model.fit(X_train_scaled, y_train)
+    y_pred_test = lr_model.predict(X_test_scaled)
+    return {
+        'C': C,
+        'Accuracy': accuracy_score(y_test, y_pred_test),
+        'Coef_Sum': np.sum(np.abs(lr_model.coef_[0])),
+        'Iteraciones': int(np.max(lr_model.n_iter_)),
+        'Solver': 'liblinear'
+    }
+
+
+def comparar_regularizacion(X_train, X_test, y_train, y_test, C_values=[0.01, 0.1, 1.0, 10.0, 100.0],
+                            warm_start=False, n_jobs=-1):
     """
-    Compara diferentes valores de regularización
+    Compara diferentes valores de regularización (camino de regularización)
+    
+    Los datos se escalan una sola vez para todos los valores de C. Por defecto
+    (warm_start=False) cada C se ajusta de forma independiente con el solver liblinear,
+    igual que entrenar_logistic_regression, en paralelo con n_jobs procesos.
+    
+    Con warm_start=True (opcional) los valores de C se recorren de menor a mayor y cada
+    ajuste parte de los coeficientes del anterior. Esto requiere el solver lbfgs, por lo
+    que los puntajes pueden diferir ligeramente de los de liblinear; a cambio permite
+    grillas densas de cientos de valores. La columna Solver de la tabla indica cuál se usó.
+    
+    Ejemplo de grilla densa: C_values=np.logspace(-3, 3, 200), warm_start=True
     """
     print("\n" + "=" * 60)
     print("COMPARACIÓN DE DIFERENTES VALORES DE REGULARIZACIÓN")
     print("=" * 60)
     
-    results = []
-    
-    for C in C_values:
-        # Normalizar datos
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        # Entrenar modelo
-        lr_model = LogisticRegression(C=C, random_state=42, max_iter=1000, solver='liblinear')
-        lr_model.fit(X_train_scaled, y_train)
-        
-        # Evaluar
-        y_pred_test = lr_model.predict(X_test_scaled)
-        accuracy = accuracy_score(y_test, y_pred_test)
-        
-        results.append({
-            'C': C,
-            'Accuracy': accuracy,
-            'Coef_Sum': np.sum(np.abs(lr_model.coef_[0]))
-        })
-        
-        print(f"C = {C:6.2f} | Accuracy = {accuracy:.4f} | Suma |coef| = {np.sum(np.abs(lr_model.coef_[0])):.4f}")
+    # Normalizar datos (una sola vez: el escalado no depende de C)
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    
+    C_sorted = np.sort(np.asarray(C_values, dtype=float))
+    
+    if warm_start:
+        # Un solo modelo que se reajusta partiendo de la solución del C anterior
+        lr_model = LogisticRegression(random_state=42, max_iter=1000, solver='lbfgs', warm_start=True)
+        results = []
+        for C in C_sorted:
+            lr_model.set_params(C=C)
+            lr_model.fit(X_train_scaled, y_train)
+            y_pred_test = lr_model.predict(X_test_scaled)
+            results.append({
+                'C': C,
+                'Accuracy': accuracy_score(y_test, y_pred_test),
+                'Coef_Sum': np.sum(np.abs(lr_model.coef_[0])),
+                'Iteraciones': int(np.max(lr_model.n_iter_)),
+                'Solver': 'lbfgs'
+            })
+    else:
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_ajustar_regularizacion)(C, X_train_scaled, X_test_scaled, y_train, y_test)
+            for C in C_sorted
+        )
+    
+    print(f"Solver: {'lbfgs con warm start' if warm_start else 'liblinear'}")
+    if len(results) <= 20:
+        for r in results:
+            print(f"C = {r['C']:6.2f} | Accuracy = {r['Accuracy']:.4f} | Suma |coef| = {r['Coef_Sum']:.4f}")
+    else:
+        mejor = max(results, key=lambda r: r['Accuracy'])
+        print(f"{len(results)} valores de C evaluados "
+              f"({sum(r['Iteraciones'] for r in results)} iteraciones en total)")
+        print(f"Mejor: C = {mejor['C']:.4g} | Accuracy = {mejor['Accuracy']:.4f}")
     
     # Graficar resultados
     results_df = pd.DataFrame(results)
@@ -163,7 +226,8 @@ def comparar_regularizacion(X_train, X_test, y_train, y_test, C_values=[0.01, 0.
     plt.figure(figsize=(12, 5))
     
     plt.subplot(1, 2, 1)
-    plt.plot(results_df['C'], results_df['Accuracy'], 'bo-')
+    estilo = '-' if len(results_df) > 20 else 'o-'
+    plt.plot(results_df['C'], results_df['Accuracy'], 'b' + estilo)
     plt.xscale('log')
     plt.xlabel('Valor de C (Regularización)')
     plt.ylabel('Precisión')
@@ -171,7 +235,7 @@ def comparar_regularizacion(X_train, X_test, y_train, y_test, C_values=[0.01, 0.
     plt.grid(True, alpha=0.3)
     
     plt.subplot(1, 2, 2)
-    plt.plot(results_df['C'], results_df['Coef_Sum'], 'ro-')
+    plt.plot(results_df['C'], results_df['Coef_Sum'], 'r' + estilo)
     plt.xscale('log')
     plt.xlabel('Valor de C (Regularización)')
     plt.ylabel('Suma de |Coeficientes|')
@@ -0,0 +1,132 @@
+"""
+Persistencia de modelos entrenados con recarga rápida por hash de datos e hiperparámetros
+"""
+
+import hashlib
+import json
+import os
+
+import joblib
+import pandas as pd
+
+from .random_forest_model import entrenar_random_forest
+from .logistic_regression_model import entrenar_logistic_regression
+
+DIRECTORIO_MODELOS = "modelos_guardados"
+
+ENTRENADORES = {
+    'random_forest': entrenar_random_forest,
+    'logistic_regression': entrenar_logistic_regression,
+}
+
+
+def calcular_hash(tipo_modelo, hiperparametros, *datos):
+    """
+    Calcula un hash SHA-256 del tipo de modelo, los hiperparámetros y los datos
+
+    Parámetros:
+    - tipo_modelo: 'random_forest' o 'logistic_regression'
+    - hiperparametros: Diccionario de hiperparámetros del entrenamiento
+    - datos: DataFrames/Series de entrenamiento y prueba (X_train, X_test, y_train, y_test)
+
+    Retorna:
+    - hash hexadecimal; cambia si cambia cualquier dato, columna o hiperparámetro
+    """
+    h = hashlib.sha256()
+    h.update(tipo_modelo.encode())
+    h.update(json.dumps(hiperparametros, sort_keys=True, default=str).encode())
+    for d in datos:
+        d = pd.DataFrame(d) if not isinstance(d, (pd.DataFrame, pd.Series)) else d
+        if isinstance(d, pd.DataFrame):
+            h.update(json.dumps([str(c) for c in d.columns]).encode())
+        h.update(pd.util.hash_pandas_object(d, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def guardar_modelo(ruta, modelo, scaler=None, caracteristicas=None, hiperparametros=None,
+                   metricas=None, hash_datos=None, medianas=None, preprocesador=None):
+    """
+    Guarda un modelo con su escalador, lista de características, medianas de
+    imputación, preprocesador ajustado y metadatos
+
+    Se guarda sin compresión para que cargar_modelo pueda mapear en memoria los
+    arreglos de los árboles del bosque (mmap) en lugar de copiarlos.
+    """
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    artefacto = {
+        'modelo': modelo,
+        'scaler': scaler,
+        'caracteristicas': list(caracteristicas) if caracteristicas is not None else None,
+        'medianas': dict(medianas) if medianas else {},
+        'preprocesador': preprocesador,
+        'hiperparametros': hiperparametros or {},
+        'metricas': metricas,
+        'hash': hash_datos,
+    }
+    joblib.dump(artefacto, ruta, compress=0)
+    return ruta
+
+
+def cargar_modelo(ruta, mmap_mode='r'):
+    """
+    Carga un artefacto guardado con guardar_modelo
+
+    Parámetros:
+    - ruta: Archivo .joblib
+    - mmap_mode: Modo de mapeo en memoria de los arreglos NumPy ('r' = solo lectura,
+      None = cargar todo en memoria)
+
+    Retorna:
+    - Diccionario con modelo, scaler, caracteristicas, medianas, preprocesador,
+      hiperparametros, metricas y hash
+    """
+    return joblib.load(ruta, mmap_mode=mmap_mode)
+
+
+def entrenar_o_cargar_modelo(tipo_modelo, X_train, X_test, y_train, y_test,
+                             directorio=DIRECTORIO_MODELOS, medianas=None, preprocesador=None,
+                             **hiperparametros):
+    """
+    Reutiliza un modelo guardado si los datos y los hiperparámetros no cambiaron;
+    en otro caso lo entrena y lo guarda
+
+    Parámetros:
+    - tipo_modelo: 'random_forest' o 'logistic_regression'
+    - X_train, X_test, y_train, y_test: Datos como en entrenar_random_forest
+    - directorio: Carpeta donde se guardan los modelos
+    - medianas: Medianas de imputación usadas en los datos (se guardan para puntuar datos nuevos)
+    - preprocesador: PreprocesadorCardiaco ajustado; si se indica, sus medianas reemplazan a medianas
+    - hiperparametros: Argumentos para la función de entrenamiento (n_estimators, C, ...)
+
+    Retorna:
+    - modelo: Modelo entrenado o recargado
+    - scaler: Escalador (None para Random Forest)
+    - metricas: Diccionario con métricas de evaluación del entrenamiento original
+    """
+    if tipo_modelo not in ENTRENADORES:
+        raise ValueError(f"Tipo de modelo desconocido '{tipo_modelo}'. Opciones: {', '.join(ENTRENADORES)}")
+
+    if preprocesador is not None:
+        medianas = preprocesador.medianas_
+
+    hash_datos = calcular_hash(tipo_modelo, {**hiperparametros, 'medianas': medianas},
+                               X_train, X_test, y_train, y_test)
+    ruta = os.path.join(directorio, f"{tipo_modelo}_{hash_datos[:16]}.joblib")
+
+    if os.path.exists(ruta):
+        artefacto = cargar_modelo(ruta)
+        if artefacto.get('hash') == hash_datos:
+            print(f"Modelo sin cambios: recargado desde {ruta}")
+            return artefacto['modelo'], artefacto['scaler'], artefacto['metricas']
+
+    resultado = ENTRENADORES[tipo_modelo](X_train, X_test, y_train, y_test, **hiperparametros)
+    if tipo_modelo == 'logistic_regression':
+        modelo, scaler, metricas = resultado
+    else:
+        (modelo, metricas), scaler = resultado, None
+
+    guardar_modelo(ruta, modelo, scaler=scaler, caracteristicas=X_train.columns,
+                   hiperparametros=hiperparametros, metricas=metricas, hash_datos=hash_datos,
+                   medianas=medianas, preprocesador=preprocesador)
+    print(f"Modelo guardado en {ruta}")
+    return modelo, scaler, metricas
@@ -0,0 +1,159 @@
+"""
+Preprocesamiento de los datos de enfermedad cardíaca compartido por entrenamiento y puntuación
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+# Variables más importantes para análisis cardíaco (mismo orden que parcial_1.py)
+COLUMNAS_MIOCARDIO = [
+    'age',           # edad
+    'sex',           # sexo
+    'cp',            # tipo de dolor en el pecho
+    'trestbps',      # presión arterial en reposo
+    'chol',          # colesterol sérico
+    'fbs',           # azúcar en sangre en ayunas
+    'restecg',       # electrocardiograma en reposo
+    'thalach',       # frecuencia cardíaca máxima alcanzada
+    'exang',         # angina inducida por ejercicio
+    'oldpeak',       # depresión del ST inducida por ejercicio
+    'slope',         # pendiente del segmento ST de ejercicio pico
+    'ca',            # número de vasos principales coloreados por fluoroscopia
+    'thal',          # talasemia
+]
+
+# Columnas con valores faltantes que se rellenan con la mediana de entrenamiento
+COLUMNAS_IMPUTACION = ['ca', 'thal']
+
+# Variable objetivo y umbral de binarización: 0,1 = Vive (0), 2,3,4 = Muere (1)
+COLUMNA_OBJETIVO = 'num'
+UMBRAL_OBJETIVO = 2
+
+
+class PreprocesadorCardiaco:
+    """
+    Preprocesamiento ajustado de los datos de enfermedad cardíaca
+
+    fit() calcula las medianas de imputación una sola vez; transform() las
+    aplica de forma vectorizada a cualquier bloque nuevo sin volver a
+    calcularlas. El objeto se guarda junto al modelo (joblib/pickle) para que
+    entrenamiento y puntuación usen exactamente el mismo preprocesamiento.
+
+    Parámetros:
+    - caracteristicas: Columnas que espera el modelo (por defecto COLUMNAS_MIOCARDIO)
+    - columnas_imputacion: Columnas cuyos faltantes se rellenan con la mediana
+    - umbral_objetivo: num >= umbral se considera clase positiva (Muere)
+    """
+
+    def __init__(self, caracteristicas=None, columnas_imputacion=None, umbral_objetivo=UMBRAL_OBJETIVO):
+        self.caracteristicas = list(caracteristicas) if caracteristicas is not None else list(COLUMNAS_MIOCARDIO)
+        self.columnas_imputacion = (list(columnas_imputacion) if columnas_imputacion is not None
+                                    else [c for c in COLUMNAS_IMPUTACION if c in self.caracteristicas])
+        self.umbral_objetivo = umbral_objetivo
+        self.medianas_ = {}
+        self._relleno = None
+
+    @classmethod
+    def desde_medianas(cls, caracteristicas=None, medianas=None):
+        """Crea un preprocesador ya ajustado a partir de medianas guardadas."""
+        preprocesador = cls(caracteristicas, columnas_imputacion=list(medianas or {}))
+        preprocesador._fijar_medianas(medianas or {})
+        return preprocesador
+
+    def _fijar_medianas(self, medianas):
+        self.medianas_ = {c: float(v) for c, v in medianas.items()}
+        # Vector de relleno alineado con las columnas (NaN = columna sin imputación)
+        self._relleno = np.array([self.medianas_.get(c, np.nan) for c in self.caracteristicas])
+
+    @property
+    def ajustado(self):
+        """True si ya se calcularon (o cargaron) las medianas."""
+        return self._relleno is not None
+
+    def _validar_columnas(self, bloque):
+        faltantes = [c for c in self.caracteristicas if c not in bloque.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en los datos: {faltantes}")
+
+    def _a_numerico(self, bloque):
+        """
+        Selecciona las características como un arreglo float64 propio ('?' de UCI -> NaN)
+
+        Es la única copia del bloque: el relleno posterior se hace sobre este arreglo.
+        """
+        seleccion = bloque[self.caracteristicas]
+        if not all(pd.api.types.is_numeric_dtype(t) for t in seleccion.dtypes):
+            seleccion = seleccion.apply(pd.to_numeric, errors='coerce')
+        return np.array(seleccion, dtype=np.float64)
+
+    def fit(self, X, y=None):
+        """Calcula las medianas de imputación sobre X (una sola vez)."""
+        self._validar_columnas(X)
+        medianas = {}
+        for c in self.columnas_imputacion:
+            medianas[c] = pd.to_numeric(X[c], errors='coerce').median()
+        self._fijar_medianas(medianas)
+        return self
+
+    def transform(self, bloque):
+        """
+        Aplica el preprocesamiento ajustado a un bloque de datos
+
+        Retorna:
+        - DataFrame float64 con las columnas en el orden del modelo y el índice del bloque
+        """
+        if not self.ajustado:
+            raise RuntimeError("El preprocesador no está ajustado: llame a fit() primero")
+        self._validar_columnas(bloque)
+        valores = self._a_numerico(bloque)
+        faltantes = np.isnan(valores)
+        if faltantes.any():
+            # Relleno vectorizado en el mismo arreglo (sin copias por columna)
+            np.copyto(valores, np.broadcast_to(self._relleno, valores.shape), where=faltantes)
+        return pd.DataFrame(valores, columns=self.caracteristicas, index=bloque.index, copy=False)
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X, y).transform(X)
+
+    def transformar_objetivo(self, y):
+        """Binariza la variable objetivo: num >= umbral_objetivo -> 1 (Muere), si no 0 (Vive)."""
+        if isinstance(y, pd.DataFrame):
+            y = y[COLUMNA_OBJETIVO] if COLUMNA_OBJETIVO in y.columns else y.iloc[:, 0]
+        return (y >= self.umbral_objetivo).astype(int)
+
+    def transformar_bloques(self, bloques):
+        """Aplica transform() a un iterable de bloques (generador, memoria acotada)."""
+        for bloque in bloques:
+            yield self.transform(bloque)
+
+    def dividir(self, X, y, test_size=0.3, random_state=42):
+        """
+        Transforma X, binariza y y hace la división estratificada train/test
+
+        Retorna:
+        - X_train, X_test, y_train, y_test
+        """
+        y_binaria = self.transformar_objetivo(y)
+        return train_test_split(
+            self.transform(X), y_binaria,
+            test_size=test_size,
+            random_state=random_state,
+            stratify=y_binaria  # Mantener proporción de clases
+        )
+
+
+def preprocesar_bloque(bloque, caracteristicas=None, medianas=None):
+    """
+    Selecciona las características y rellena faltantes de un bloque de datos nuevos
+
+    Parámetros:
+    - bloque: DataFrame con (al menos) las columnas de características
+    - caracteristicas: Columnas que espera el modelo (por defecto COLUMNAS_MIOCARDIO)
+    - medianas: Diccionario {columna: mediana} calculado en entrenamiento
+
+    Retorna:
+    - DataFrame numérico con las columnas en el orden del modelo
+    """
+    preprocesador = PreprocesadorCardiaco.desde_medianas(caracteristicas, medianas)
+    return preprocesador.transform(bloque)
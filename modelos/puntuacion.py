@@ -0,0 +1,208 @@
+"""
+Puntuación por lotes de pacientes nuevos con un modelo guardado (Random Forest o Regresión Logística)
+
+Uso:
+    python -m modelos.puntuacion modelo.joblib pacientes.csv predicciones.csv --bloque 100000 --n-jobs 4
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .persistencia import cargar_modelo
+from .preprocesamiento import PreprocesadorCardiaco
+
+TAMANO_BLOQUE = 100_000
+
+# Artefacto cargado una sola vez por proceso trabajador
+_ARTEFACTO = None
+
+
+def _formato(ruta):
+    """Deduce el formato (csv o parquet) por la extensión del archivo."""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension in ('.csv', '.txt', '.gz'):
+        return 'csv'
+    raise ValueError(f"Formato no soportado: '{extension}' (use .csv o .parquet)")
+
+
+def _importar_pyarrow():
+    """Importa pyarrow (necesario para Parquet) con un error claro si no está instalado."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(
+            "Leer o escribir archivos Parquet requiere pyarrow (pip install pyarrow); use .csv en su lugar"
+        ) from e
+    return pa, pq
+
+
+def leer_bloques(ruta, tamano_bloque=TAMANO_BLOQUE, columnas=None):
+    """
+    Lee un archivo CSV o Parquet en bloques de tamano_bloque filas (generador)
+    """
+    if _formato(ruta) == 'parquet':
+        _, pq = _importar_pyarrow()
+        archivo = pq.ParquetFile(ruta)
+        for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=columnas):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque, usecols=columnas, na_values=['?'])
+
+
+class EscritorIncremental:
+    """Escribe bloques de resultados en CSV o Parquet sin acumularlos en memoria."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.formato = _formato(ruta)
+        self._archivo = None
+        self._writer = None
+
+    def escribir(self, bloque):
+        if self.formato == 'parquet':
+            pa, pq = _importar_pyarrow()
+            tabla = pa.Table.from_pandas(bloque, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.ruta, tabla.schema)
+            self._writer.write_table(tabla)
+        else:
+            primera_vez = self._archivo is None
+            if primera_vez:
+                self._archivo = open(self.ruta, 'w', newline='', encoding='utf-8')
+            bloque.to_csv(self._archivo, header=primera_vez, index=False)
+
+    def cerrar(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._archivo is not None:
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def puntuar_bloque(bloque, artefacto, columnas_id=None):
+    """
+    Preprocesa y puntúa un bloque de pacientes
+
+    Parámetros:
+    - bloque: DataFrame con las columnas de características (y opcionalmente de id)
+    - artefacto: Diccionario devuelto por cargar_modelo (con preprocesador, ver _asegurar_preprocesador)
+    - columnas_id: Columnas a copiar a la salida para identificar cada fila
+
+    Retorna:
+    - DataFrame con columnas_id, prediccion y probabilidad (clase positiva = 1, Muere)
+    """
+    X = artefacto['preprocesador'].transform(bloque)
+    if artefacto.get('scaler') is not None:
+        X = artefacto['scaler'].transform(X)
+
+    modelo = artefacto['modelo']
+    probabilidades = modelo.predict_proba(X)
+
+    salida = bloque[list(columnas_id)].reset_index(drop=True) if columnas_id else pd.DataFrame()
+    salida['prediccion'] = modelo.classes_[np.argmax(probabilidades, axis=1)]
+    salida['probabilidad'] = probabilidades[:, -1]
+    return salida
+
+
+def _asegurar_preprocesador(artefacto):
+    """Crea el preprocesador una sola vez para artefactos guardados solo con medianas."""
+    if artefacto.get('preprocesador') is None:
+        artefacto['preprocesador'] = PreprocesadorCardiaco.desde_medianas(
+            artefacto['caracteristicas'], artefacto.get('medianas'))
+    return artefacto
+
+
+def _inicializar_trabajador(ruta_modelo):
+    """Carga el modelo en cada proceso y evita hilos anidados dentro del bosque."""
+    global _ARTEFACTO
+    _ARTEFACTO = _asegurar_preprocesador(cargar_modelo(ruta_modelo))
+    if hasattr(_ARTEFACTO['modelo'], 'n_jobs'):
+        _ARTEFACTO['modelo'].n_jobs = 1
+
+
+def _puntuar_bloque_trabajador(bloque, columnas_id):
+    return puntuar_bloque(bloque, _ARTEFACTO, columnas_id)
+
+
+def puntuar_archivo(ruta_modelo, ruta_entrada, ruta_salida, tamano_bloque=TAMANO_BLOQUE,
+                    n_jobs=1, columnas_id=None):
+    """
+    Puntúa un archivo CSV/Parquet de cualquier tamaño en bloques
+
+    La memoria queda acotada por tamano_bloque x (2 x n_jobs) bloques en vuelo:
+    los resultados se escriben en orden a medida que terminan.
+
+    Parámetros:
+    - ruta_modelo: Archivo guardado con guardar_modelo / entrenar_o_cargar_modelo
+    - ruta_entrada: Archivo .csv o .parquet con pacientes nuevos
+    - ruta_salida: Archivo .csv o .parquet de predicciones
+    - tamano_bloque: Filas por bloque
+    - n_jobs: Procesos en paralelo (-1 = todos los núcleos)
+    - columnas_id: Columnas a copiar a la salida (p. ej. ['id_paciente'])
+
+    Retorna:
+    - Número de filas puntuadas
+    """
+    artefacto = _asegurar_preprocesador(cargar_modelo(ruta_modelo))
+    columnas = list(artefacto['caracteristicas']) + [c for c in (columnas_id or [])
+                                                     if c not in artefacto['caracteristicas']]
+    n_jobs = (os.cpu_count() or 1) if n_jobs in (None, -1) else max(1, n_jobs)
+    bloques = leer_bloques(ruta_entrada, tamano_bloque, columnas)
+    total = 0
+
+    with EscritorIncremental(ruta_salida) as escritor:
+        if n_jobs == 1:
+            for bloque in bloques:
+                resultado = puntuar_bloque(bloque, artefacto, columnas_id)
+                escritor.escribir(resultado)
+                total += len(resultado)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_trabajador,
+                                     initargs=(ruta_modelo,)) as executor:
+                pendientes = deque()
+                for bloque in bloques:
+                    pendientes.append(executor.submit(_puntuar_bloque_trabajador, bloque, columnas_id))
+                    # Limitar los bloques en vuelo para mantener la memoria constante
+                    if len(pendientes) >= 2 * n_jobs:
+                        resultado = pendientes.popleft().result()
+                        escritor.escribir(resultado)
+                        total += len(resultado)
+                while pendientes:
+                    resultado = pendientes.popleft().result()
+                    escritor.escribir(resultado)
+                    total += len(resultado)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Puntuación por lotes con un modelo de enfermedad cardíaca guardado")
+    parser.add_argument("modelo", help="archivo .joblib del modelo guardado")
+    parser.add_argument("entrada", help="archivo .csv o .parquet con pacientes")
+    parser.add_argument("salida", help="archivo .csv o .parquet de predicciones")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="filas por bloque")
+    parser.add_argument("--n-jobs", type=int, default=1, help="procesos en paralelo (-1 = todos)")
+    parser.add_argument("--id", nargs="*", default=None, help="columnas a copiar a la salida")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    total = puntuar_archivo(args.modelo, args.entrada, args.salida, args.bloque, args.n_jobs, args.id)
+    duracion = time.perf_counter() - inicio
+    print(f"{total} filas puntuadas en {duracion:.1f} s -> {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,37 @@
 Modelo de Random Forest para clasificación de enfermedades cardíacas
 """
 
+import os
+import time
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (habilita HalvingGridSearchCV)
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from metricas import format_classification_report
 
-def entrenar_random_forest(X_train, X_test, y_train, y_test, n_estimators=100, random_state=42):
+from .graficos import obtener_figura, guardar_figura
+
+
+def _crear_random_forest(n_estimators=100, random_state=42, max_depth=10, min_samples_split=5,
+                         min_samples_leaf=2, n_jobs=None):
+    """Bosque con la configuración de entrenar_random_forest (compartido con la validación cruzada)."""
+    return RandomForestClassifier(
+        n_estimators=n_estimators,
+        random_state=random_state,
+        max_depth=max_depth,
+        min_samples_split=min_samples_split,
+        min_samples_leaf=min_samples_leaf,
+        n_jobs=n_jobs
+    )
+
+
+def entrenar_random_forest(X_train, X_test, y_train, y_test, n_estimators=100, random_state=42,
+                           max_depth=10, min_samples_split=5, min_samples_leaf=2, n_jobs=None):
     """
     Entrena un modelo de Random Forest para clasificación
     
@@ -21,6 +43,9 @@ def entrenar_random_forest(X_train, X_test, y_train, y_test, n_estimators=100, r
     - y_test: Etiquetas de prueba
     - n_estimators: Número de árboles en el bosque
     - random_state: Semilla para reproducibilidad
+    - max_depth, min_samples_split, min_samples_leaf: Hiperparámetros de los árboles
+      (ver buscar_hiperparametros_random_forest)
+    - n_jobs: Núcleos para entrenar los árboles en paralelo (-1 = todos)
     
     Retorna:
     - modelo: Modelo entrenado
@@ -32,13 +57,8 @@ def entrenar_random_forest(X_train, X_test, y_train, y_test, n_estimators=100, r
     print("=" * 60)
     
     # Crear y entrenar el modelo
-    rf_model = RandomForestClassifier(
-        n_estimators=n_estimators,
-        random_state=random_state,
-        max_depth=10,
-        min_samples_split=5,
-        min_samples_leaf=2
-    )
+    rf_model = _crear_random_forest(n_estimators, random_state, max_depth, min_samples_split,
+                                    min_samples_leaf, n_jobs)
     
     print(f"Entrenando Random Forest con {n_estimators} árboles...")
     rf_model.fit(X_train, y_train)
@@ -54,10 +74,11 @@ def entrenar_random_forest(X_train, X_test, y_train, y_test, n_estimators=100, r
     print(f"\nPrecisión en entrenamiento: {accuracy_train:.4f}")
     print(f"Precisión en prueba: {accuracy_test:.4f}")
     
-    # Crear reporte de clasificación
+    # Crear reporte de clasificación (se calcula una sola vez para imprimir y guardar)
+    reporte = classification_report(y_test, y_pred_test, output_dict=True)
     print("\nReporte de Clasificación (Conjunto de Prueba):")
     print("-" * 50)
-    print(classification_report(y_test, y_pred_test))
+    print(format_classification_report(reporte))
     
     # Mostrar importancia de características
     feature_importance = pd.DataFrame({
@@ -73,7 +94,7 @@ def entrenar_random_forest(X_train, X_test, y_train, y_test, n_estimators=100, r
     metricas = {
         'accuracy_train': accuracy_train,
         'accuracy_test': accuracy_test,
-        'classification_report': classification_report(y_test, y_pred_test, output_dict=True),
+        'classification_report': reporte,
         'feature_importance': feature_importance,
         'y_pred_test': y_pred_test
     }
@@ -81,33 +102,147 @@ def entrenar_random_forest(X_train, X_test, y_train, y_test, n_estimators=100, r
     return rf_model, metricas
 
 
-def graficar_importancia_caracteristicas(metricas, top_n=10):
+def _repartir_nucleos(n_folds, n_jobs=-1):
+    """
+    Reparte los núcleos entre procesos (folds/candidatos) y árboles de cada bosque
+    para que procesos x hilos no supere los núcleos disponibles.
+    """
+    total = os.cpu_count() or 1
+    if n_jobs is not None and n_jobs > 0:
+        total = min(total, n_jobs)
+    procesos = max(1, min(n_folds, total))
+    hilos_por_bosque = max(1, total // procesos)
+    return procesos, hilos_por_bosque
+
+
+def buscar_hiperparametros_random_forest(X_train, y_train, param_grid=None, n_estimators=100, cv=5,
+                                         factor=3, min_estimators=10, scoring='f1',
+                                         random_state=42, n_jobs=-1):
+    """
+    Busca hiperparámetros de Random Forest con validación cruzada y successive halving
+    
+    Todas las combinaciones empiezan con pocos árboles (min_estimators); en cada ronda
+    solo la mejor 1/factor de las combinaciones continúa con factor veces más árboles,
+    hasta n_estimators. Así las configuraciones malas se descartan temprano.
+    
+    Parámetros:
+    - X_train: Datos de entrenamiento (features)
+    - y_train: Etiquetas de entrenamiento
+    - param_grid: Diccionario de hiperparámetros a explorar (por defecto max_depth,
+      min_samples_split y min_samples_leaf alrededor de los valores de entrenar_random_forest)
+    - n_estimators: Número máximo de árboles (recurso de la última ronda)
+    - cv: Número de folds estratificados
+    - factor: Proporción de eliminación entre rondas
+    - min_estimators: Árboles por modelo en la primera ronda
+    - scoring: Métrica de sklearn a maximizar
+    - random_state: Semilla para reproducibilidad
+    - n_jobs: Núcleos a usar (-1 = todos); se reparten entre folds y árboles
+    
+    Retorna:
+    - mejores_parametros: Diccionario con la mejor combinación (para entrenar_random_forest)
+    - resultados: DataFrame con cada combinación evaluada por ronda, su puntaje y tiempos
+    """
+    
+    print("=" * 60)
+    print("BÚSQUEDA DE HIPERPARÁMETROS - RANDOM FOREST")
+    print("=" * 60)
+    
+    if param_grid is None:
+        param_grid = {
+            'max_depth': [5, 10, 20, None],
+            'min_samples_split': [2, 5, 10],
+            'min_samples_leaf': [1, 2, 4]
+        }
+    
+    procesos, hilos_por_bosque = _repartir_nucleos(cv, n_jobs)
+    print(f"Usando {procesos} procesos x {hilos_por_bosque} hilos por bosque")
+    
+    busqueda = HalvingGridSearchCV(
+        RandomForestClassifier(random_state=random_state, n_jobs=hilos_por_bosque),
+        param_grid,
+        resource='n_estimators',
+        min_resources=min(min_estimators, n_estimators),
+        max_resources=n_estimators,
+        factor=factor,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state),
+        scoring=scoring,
+        refit=False,
+        n_jobs=procesos,
+        random_state=random_state
+    )
+    
+    inicio = time.perf_counter()
+    busqueda.fit(X_train, y_train)
+    duracion = time.perf_counter() - inicio
+    
+    cv_results = busqueda.cv_results_
+    parametros = list(cv_results['params'])
+    resultados = pd.DataFrame(parametros)
+    # Columnas con None (p. ej. max_depth) como object: pandas las convertiría a float con NaN
+    for columna in resultados.columns:
+        valores = [p.get(columna) for p in parametros]
+        if any(v is None for v in valores):
+            resultados[columna] = pd.Series(valores, index=resultados.index, dtype=object)
+    resultados.insert(0, 'ronda', cv_results['iter'])
+    resultados['n_estimators'] = cv_results['n_resources']
+    resultados['puntaje_medio'] = cv_results['mean_test_score']
+    resultados['puntaje_std'] = cv_results['std_test_score']
+    resultados['tiempo_entrenamiento_s'] = cv_results['mean_fit_time']
+    resultados['tiempo_prediccion_s'] = cv_results['mean_score_time']
+    resultados = resultados.sort_values(['ronda', 'puntaje_medio'], ascending=[False, False])
+    
+    mejores_parametros = dict(busqueda.best_params_)
+    mejores_parametros.pop('n_estimators', None)
+    
+    print(f"\nModelos evaluados: {len(resultados)} "
+          f"en {busqueda.n_iterations_} rondas ({duracion:.1f} s)")
+    print(f"Mejores parámetros: {mejores_parametros}")
+    print(f"Mejor {scoring} (CV): {busqueda.best_score_:.4f}")
+    print("\nTop 10 combinaciones de la última ronda:")
+    print("-" * 60)
+    ultima_ronda = resultados[resultados['ronda'] == busqueda.n_iterations_ - 1]
+    print(ultima_ronda.head(10).to_string(index=False))
+    
+    return mejores_parametros, resultados
+
+
+def graficar_importancia_caracteristicas(metricas, top_n=10, ruta=None):
     """
     Grafica la importancia de las características más importantes
+
+    Con ruta (.png o .svg) la figura se guarda en archivo sin mostrarse (ver modelos.graficos)
     """
-    plt.figure(figsize=(10, 6))
+    fig = obtener_figura('importancia_rf', (10, 6)) if ruta else plt.figure(figsize=(10, 6))
+    ax = fig.add_subplot()
     top_features = metricas['feature_importance'].head(top_n)
     
-    plt.barh(range(len(top_features)), top_features['importancia'])
-    plt.yticks(range(len(top_features)), top_features['caracteristica'])
-    plt.xlabel('Importancia')
-    plt.title(f'Top {top_n} Características Más Importantes - Bosque Aleatorio')
-    plt.gca().invert_yaxis()
-    plt.tight_layout()
+    ax.barh(range(len(top_features)), top_features['importancia'])
+    ax.set_yticks(range(len(top_features)), top_features['caracteristica'])
+    ax.set_xlabel('Importancia')
+    ax.set_title(f'Top {top_n} Características Más Importantes - Bosque Aleatorio')
+    ax.invert_yaxis()
+    if ruta:
+        return guardar_figura(fig, ruta)
+    fig.tight_layout()
     plt.show()
 
 
-def graficar_matriz_confusion(y_test, y_pred, titulo="Matriz de Confusión - Bosque Aleatorio"):
+def graficar_matriz_confusion(y_test, y_pred, titulo="Matriz de Confusión - Bosque Aleatorio", ruta=None):
     """
     Grafica la matriz de confusión
+
+    Con ruta (.png o .svg) la figura se guarda en archivo sin mostrarse (ver modelos.graficos)
     """
-    plt.figure(figsize=(8, 6))
+    fig = obtener_figura('matriz_confusion', (8, 6)) if ruta else plt.figure(figsize=(8, 6))
+    ax = fig.add_subplot()
     cm = confusion_matrix(y_test, y_pred)
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', ax=ax,
                 xticklabels=['Vive', 'Muere'],
                 yticklabels=['Vive', 'Muere'])
-    plt.title(titulo)
-    plt.ylabel('Valor Real')
-    plt.xlabel('Valor Predicho')
-    plt.tight_layout()
+    ax.set_title(titulo)
+    ax.set_ylabel('Valor Real')
+    ax.set_xlabel('Valor Predicho')
+    if ruta:
+        return guardar_figura(fig, ruta)
+    fig.tight_layout()
     plt.show()
@@ -0,0 +1,107 @@
+"""
+Validación cruzada K-fold en paralelo para Random Forest y Regresión Logística
+"""
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import confusion_matrix
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+from metricas import compute_metrics, print_report, summarize_reports
+
+from .random_forest_model import _crear_random_forest, _repartir_nucleos
+from .logistic_regression_model import _crear_logistic_regression
+
+# Constructores de modelos con la misma configuración que las funciones de entrenamiento
+CONSTRUCTORES = {
+    'random_forest': _crear_random_forest,
+    'logistic_regression': _crear_logistic_regression,
+}
+
+# Modelos que requieren normalizar los datos (como entrenar_logistic_regression)
+REQUIEREN_ESCALADO = {'logistic_regression'}
+
+
+def _evaluar_pliegue(tipo_modelo, X, y, indices_train, indices_test, hiperparametros):
+    """
+    Entrena y evalúa un fold: un solo ajuste del escalador (si aplica) y una sola
+    matriz de confusión por fold
+
+    Retorna:
+    - Diccionario de compute_metrics del conjunto de prueba del fold más accuracy_train
+    """
+    X_train, X_test = X[indices_train], X[indices_test]
+    y_train, y_test = y[indices_train], y[indices_test]
+
+    if tipo_modelo in REQUIEREN_ESCALADO:
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+        X_test = scaler.transform(X_test)
+
+    modelo = CONSTRUCTORES[tipo_modelo](**hiperparametros)
+    modelo.fit(X_train, y_train)
+
+    tn, fp, fn, tp = confusion_matrix(y_test, modelo.predict(X_test), labels=[0, 1]).ravel()
+    metricas = compute_metrics(tp=tp, fp=fp, tn=tn, fn=fn)
+    metricas['accuracy_train'] = float(np.mean(modelo.predict(X_train) == y_train))
+    return metricas
+
+
+def validacion_cruzada(tipo_modelo, X, y, cv=5, random_state=42, n_jobs=-1, verbose=True,
+                       **hiperparametros):
+    """
+    Evalúa un modelo con validación cruzada K-fold estratificada, con los folds en paralelo
+
+    Alternativa a la evaluación con una sola división train/test de entrenar_random_forest
+    y entrenar_logistic_regression, con los mismos hiperparámetros.
+
+    Parámetros:
+    - tipo_modelo: 'random_forest' o 'logistic_regression'
+    - X: Características ya preprocesadas (DataFrame o arreglo)
+    - y: Variable objetivo binaria (0 = Vive, 1 = Muere)
+    - cv: Número de folds
+    - random_state: Semilla de la partición en folds y del modelo
+    - n_jobs: Núcleos a usar (-1 = todos); se reparten entre folds y árboles del bosque
+    - verbose: Imprimir el resumen
+    - hiperparametros: Argumentos del modelo (n_estimators, max_depth, C, ...)
+
+    Retorna:
+    - Diccionario con:
+      - 'folds': DataFrame con las métricas de compute_metrics de cada fold
+      - 'resumen': DataFrame con media y desviación estándar de cada métrica entre folds
+      - 'agregado': compute_metrics sobre la suma de las matrices de confusión de todos los folds
+    """
+    if tipo_modelo not in CONSTRUCTORES:
+        raise ValueError(f"Tipo de modelo desconocido '{tipo_modelo}'. Opciones: {', '.join(CONSTRUCTORES)}")
+
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y).ravel()
+    hiperparametros.setdefault('random_state', random_state)
+
+    procesos, hilos_por_bosque = _repartir_nucleos(cv, n_jobs)
+    if tipo_modelo == 'random_forest':
+        hiperparametros.setdefault('n_jobs', hilos_por_bosque)
+
+    pliegues = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(X, y)
+    reportes = Parallel(n_jobs=procesos)(
+        delayed(_evaluar_pliegue)(tipo_modelo, X, y, indices_train, indices_test, hiperparametros)
+        for indices_train, indices_test in pliegues
+    )
+
+    folds = pd.DataFrame.from_records(reportes)
+    folds.insert(0, 'fold', np.arange(1, len(reportes) + 1))
+    resumen = summarize_reports(reportes)
+    agregado = compute_metrics(**{k: int(folds[k].sum()) for k in ('tp', 'fp', 'tn', 'fn')})
+
+    if verbose:
+        print("=" * 60)
+        print(f"VALIDACIÓN CRUZADA {cv}-FOLD - {tipo_modelo.upper()} ({procesos} procesos)")
+        print("=" * 60)
+        print(resumen.loc[['accuracy', 'accuracy_train', 'recall', 'specificity', 'precision', 'f1']]
+              .to_string(float_format=lambda v: f"{v:.4f}"))
+        print("\nMétricas sobre la matriz de confusión acumulada de todos los folds:")
+        print_report(agregado, True)
+
+    return {'folds': folds, 'resumen': resumen, 'agregado': agregado}
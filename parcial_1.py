@@ -1,117 +1,109 @@
 import os
-from ucimlrepo import fetch_ucirepo
+import argparse
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
+import matplotlib
 import matplotlib.pyplot as plt
 
 # Importar los modelos personalizados
-from modelos.random_forest_model import entrenar_random_forest, graficar_importancia_caracteristicas, graficar_matriz_confusion as rf_matriz_confusion
-from modelos.logistic_regression_model import entrenar_logistic_regression, graficar_coeficientes, graficar_matriz_confusion as lr_matriz_confusion, comparar_regularizacion
+from modelos.random_forest_model import graficar_importancia_caracteristicas, graficar_matriz_confusion as rf_matriz_confusion
+from modelos.logistic_regression_model import graficar_coeficientes, graficar_matriz_confusion as lr_matriz_confusion, comparar_regularizacion
+from modelos.persistencia import entrenar_o_cargar_modelo
+from modelos.datos import cargar_dataset_uci
+from modelos.preprocesamiento import PreprocesadorCardiaco, COLUMNAS_MIOCARDIO, COLUMNA_OBJETIVO
+from modelos.experimentos import ejecutar_experimentos, resumir_por_experimento
+from modelos.validacion_cruzada import validacion_cruzada
 
 # Importar métricas de clasificación
 from sklearn.metrics import confusion_matrix
 from metricas import compute_metrics, print_report
 
-# Limpiar pantalla según el sistema operativo
-if os.name == "nt":  # Windows
-    os.system("cls")
-else:  # macOS/Linux
-    os.system("clear")
-
-# import dataset
-heart_disease = fetch_ucirepo(id=45)
-
-# access data
-X = heart_disease.data.features
-y = heart_disease.data.targets
-
-# Combinar features y targets en un DataFrame
-df = pd.concat([X, y], axis=1)
-
-# Filtrar solo columnas relevantes para exploración del miocardio
-# Estas son las variables más importantes para análisis cardíaco
-miocardio_columns = [
-    'age',           # edad
-    'sex',           # sexo
-    'cp',            # tipo de dolor en el pecho
-    'trestbps',      # presión arterial en reposo
-    'chol',          # colesterol sérico
-    'fbs',           # azúcar en sangre en ayunas
-    'restecg',       # electrocardiograma en reposo
-    'thalach',       # frecuencia cardíaca máxima alcanzada
-    'exang',         # angina inducida por ejercicio
-    'oldpeak',       # depresión del ST inducida por ejercicio
-    'slope',         # pendiente del segmento ST de ejercicio pico
-    'ca',            # número de vasos principales coloreados por fluoroscopia
-    'thal',          # talasemia
-    'num'            # diagnóstico (target)
-]
-
-# Crear DataFrame solo con datos de miocardio
-df_miocardio = df[miocardio_columns]
-
-# Mostrar información del dataset de miocardio
-print("Información del dataset - Exploración del Miocardio:")
-print(f"- Dimensiones: {df_miocardio.shape[0]} filas x {df_miocardio.shape[1]} columnas")
-print(f"- Columnas: {list(df_miocardio.columns)}")
-
-# Mostrar los primeros 5 datos en tabla
-print(f"\nPrimeros 5 registros - Datos de Miocardio:")
-print("=" * 100)
-print(df_miocardio.head().to_string(index=False))
-
-# Análisis exploratorio básico
-print(f"\nAnálisis Exploratorio del Dataset:")
-print("=" * 50)
-print(f"\nEstadísticas descriptivas:")
-print(df_miocardio.describe())
-
-# Preparar datos para modelado
-print(f"\nPreparando datos para modelado...")
-print("=" * 50)
-
-# Manejar valores faltantes
-# Rellenar valores faltantes con la mediana para variables numéricas
-df_miocardio_clean = df_miocardio.copy()
-df_miocardio_clean['ca'] = df_miocardio_clean['ca'].fillna(df_miocardio_clean['ca'].median())
-df_miocardio_clean['thal'] = df_miocardio_clean['thal'].fillna(df_miocardio_clean['thal'].median())
-
-# Separar características (X) y variable objetivo (y)
-X = df_miocardio_clean.drop('num', axis=1)  # Todas las columnas excepto 'num'
-y = df_miocardio_clean['num']  # Variable objetivo
-
-# Convertir variable objetivo a binaria para predicción de supervivencia
-# El dataset original tiene valores 0, 1, 2, 3, 4 para diferentes niveles de enfermedad
-# Para predicción de supervivencia: 0 = Vive (sin enfermedad o enfermedad leve), 1 = Muere (enfermedad severa)
-# Mapeo: 0,1 = Vive (0), 2,3,4 = Muere (1)
-y_binary = (y >= 2).astype(int)
-
-print(f"Distribución de la variable objetivo (supervivencia):")
-print(f"- Vive (0): {sum(y_binary == 0)} casos ({sum(y_binary == 0)/len(y_binary)*100:.1f}%)")
-print(f"- Muere (1): {sum(y_binary == 1)} casos ({sum(y_binary == 1)/len(y_binary)*100:.1f}%)")
-
-# División train/test (70% entrenamiento, 30% prueba)
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y_binary, 
-    test_size=0.3, 
-    random_state=42, 
-    stratify=y_binary  # Mantener proporción de clases
-)
-
-print(f"\nDivisión de datos:")
-print(f"- Conjunto de entrenamiento: {X_train.shape[0]} muestras ({X_train.shape[0]/len(X)*100:.1f}%)")
-print(f"- Conjunto de prueba: {X_test.shape[0]} muestras ({X_test.shape[0]/len(X)*100:.1f}%)")
-
-# Verificar distribución de clases en cada conjunto
-print(f"\nDistribución de clases en entrenamiento:")
-print(f"- Vive: {sum(y_train == 0)} ({sum(y_train == 0)/len(y_train)*100:.1f}%)")
-print(f"- Muere: {sum(y_train == 1)} ({sum(y_train == 1)/len(y_train)*100:.1f}%)")
-
-print(f"\nDistribución de clases en prueba:")
-print(f"- Vive: {sum(y_test == 0)} ({sum(y_test == 0)/len(y_test)*100:.1f}%)")
-print(f"- Muere: {sum(y_test == 1)} ({sum(y_test == 1)/len(y_test)*100:.1f}%)")
+
+def crear_parser():
+    """Argumentos de línea de comandos; sin --modelo ni --experimentos se muestra el menú."""
+    # Modo no interactivo: --modelo o --experimentos ejecutan sin menú, sin input() y sin ventanas
+    parser = argparse.ArgumentParser(description="Predicción de supervivencia por infarto al miocardio")
+    parser.add_argument("--modelo", choices=["random_forest", "logistic_regression", "todos"],
+                        help="entrenar sin menú el modelo indicado")
+    parser.add_argument("--semillas", type=int, nargs="+", default=[42], help="semillas para --modelo")
+    parser.add_argument("--cv", type=int, default=None, help="con --modelo: validación cruzada K-fold en lugar de una sola división")
+    parser.add_argument("--experimentos", help="archivo JSON con un lote de experimentos (ver modelos/experimentos.py)")
+    parser.add_argument("--salida", default="resultados_experimentos", help="carpeta de métricas y figuras")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="procesos en paralelo (-1 = todos)")
+    return parser
+
+
+def preparar_datos(interactivo=True):
+    """
+    Carga el dataset, muestra el análisis exploratorio y divide en entrenamiento y prueba.
+    Retorna (X, y, preprocesador, y_binary, X_train, X_test, y_train, y_test).
+    """
+    # Limpiar pantalla según el sistema operativo
+    if interactivo:
+        if os.name == "nt":  # Windows
+            os.system("cls")
+        else:  # macOS/Linux
+            os.system("clear")
+
+    # import dataset (se descarga solo la primera vez; luego se lee de la caché local)
+    X, y = cargar_dataset_uci(45)
+
+    # Filtrar solo columnas relevantes para exploración del miocardio
+    # Estas son las variables más importantes para análisis cardíaco (ver COLUMNAS_MIOCARDIO)
+    miocardio_columns = COLUMNAS_MIOCARDIO + [COLUMNA_OBJETIVO]  # 'num' = diagnóstico (target)
+
+    # Mostrar información del dataset de miocardio
+    print("Información del dataset - Exploración del Miocardio:")
+    print(f"- Dimensiones: {X.shape[0]} filas x {len(miocardio_columns)} columnas")
+    print(f"- Columnas: {miocardio_columns}")
+
+    # Mostrar los primeros 5 datos en tabla (solo se combinan 5 filas, no el dataset completo)
+    print(f"\nPrimeros 5 registros - Datos de Miocardio:")
+    print("=" * 100)
+    print(X[COLUMNAS_MIOCARDIO].head().join(y[COLUMNA_OBJETIVO]).to_string(index=False))
+
+    # Análisis exploratorio básico
+    print(f"\nAnálisis Exploratorio del Dataset:")
+    print("=" * 50)
+    print(f"\nEstadísticas descriptivas:")
+    print(X[COLUMNAS_MIOCARDIO].join(y[COLUMNA_OBJETIVO]).describe())
+
+    # Preparar datos para modelado
+    print(f"\nPreparando datos para modelado...")
+    print("=" * 50)
+
+    # Preprocesador ajustado una sola vez: selección de columnas y medianas de 'ca'/'thal'
+    # para rellenar faltantes. Se guarda con el modelo y se reutiliza al puntuar datos nuevos.
+    preprocesador = PreprocesadorCardiaco().fit(X)
+
+    # Convertir variable objetivo a binaria para predicción de supervivencia
+    # El dataset original tiene valores 0, 1, 2, 3, 4 para diferentes niveles de enfermedad
+    # Para predicción de supervivencia: 0 = Vive (sin enfermedad o enfermedad leve), 1 = Muere (enfermedad severa)
+    # Mapeo: 0,1 = Vive (0), 2,3,4 = Muere (1)
+    y_binary = preprocesador.transformar_objetivo(y)
+
+    print(f"Distribución de la variable objetivo (supervivencia):")
+    print(f"- Vive (0): {sum(y_binary == 0)} casos ({sum(y_binary == 0)/len(y_binary)*100:.1f}%)")
+    print(f"- Muere (1): {sum(y_binary == 1)} casos ({sum(y_binary == 1)/len(y_binary)*100:.1f}%)")
+
+    # División train/test estratificada (70% entrenamiento, 30% prueba)
+    X_train, X_test, y_train, y_test = preprocesador.dividir(X, y, test_size=0.3, random_state=42)
+
+    print(f"\nDivisión de datos:")
+    print(f"- Conjunto de entrenamiento: {X_train.shape[0]} muestras ({X_train.shape[0]/len(X)*100:.1f}%)")
+    print(f"- Conjunto de prueba: {X_test.shape[0]} muestras ({X_test.shape[0]/len(X)*100:.1f}%)")
+
+    # Verificar distribución de clases en cada conjunto
+    print(f"\nDistribución de clases en entrenamiento:")
+    print(f"- Vive: {sum(y_train == 0)} ({sum(y_train == 0)/len(y_train)*100:.1f}%)")
+    print(f"- Muere: {sum(y_train == 1)} ({sum(y_train == 1)/len(y_train)*100:.1f}%)")
+
+    print(f"\nDistribución de clases en prueba:")
+    print(f"- Vive: {sum(y_test == 0)} ({sum(y_test == 0)/len(y_test)*100:.1f}%)")
+    print(f"- Muere: {sum(y_test == 1)} ({sum(y_test == 1)/len(y_test)*100:.1f}%)")
+
+    return X, y, preprocesador, y_binary, X_train, X_test, y_train, y_test
 
 
 # FUNCIÓN PARA MOSTRAR EL MENÚ
@@ -137,14 +129,15 @@ def obtener_opcion():
             print("Por favor, ingrese un número válido")
 
 # FUNCIÓN PARA EJECUTAR RANDOM FOREST
-def ejecutar_random_forest():
+def ejecutar_random_forest(preprocesador, X_train, X_test, y_train, y_test):
     print(f"\n" + "="*50)
     print("INICIANDO ENTRENAMIENTO DE RANDOM FOREST")
     print("="*50)
     
     print(f"\n1. ENTRENANDO RANDOM FOREST")
     print("-" * 40)
-    rf_model, rf_metricas = entrenar_random_forest(X_train, X_test, y_train, y_test)
+    # Reutiliza el modelo guardado si los datos y los hiperparámetros no cambiaron
+    rf_model, _, rf_metricas = entrenar_o_cargar_modelo('random_forest', X_train, X_test, y_train, y_test, preprocesador=preprocesador)
     
     # Graficar importancia de características
     print(f"\nGenerando gráficos para Random Forest...")
@@ -170,18 +163,18 @@ def ejecutar_random_forest():
 
     # Pausa para que el usuario pueda leer las métricas
     input("\nPresione una tecla para continuar...")
-    
-  
+
 
 # FUNCIÓN PARA EJECUTAR REGRESIÓN LOGÍSTICA
-def ejecutar_regresion_logistica():
+def ejecutar_regresion_logistica(preprocesador, X_train, X_test, y_train, y_test):
     print(f"\n" + "="*50)
     print("INICIANDO ENTRENAMIENTO DE REGRESIÓN LOGÍSTICA")
     print("="*50)
     
     print(f"\n2. ENTRENANDO REGRESIÓN LOGÍSTICA REGULARIZADA")
     print("-" * 50)
-    lr_model, scaler, lr_metricas = entrenar_logistic_regression(X_train, X_test, y_train, y_test, C=1.0)
+    # Reutiliza el modelo guardado si los datos y los hiperparámetros no cambiaron
+    lr_model, scaler, lr_metricas = entrenar_o_cargar_modelo('logistic_regression', X_train, X_test, y_train, y_test, preprocesador=preprocesador, C=1.0)
     
     # Graficar coeficientes
     print(f"\nGenerando gráficos para Regresión Logística...")
@@ -211,21 +204,58 @@ def ejecutar_regresion_logistica():
 
     # Pausa para que el usuario pueda leer las métricas
     input("\nPresione una tecla para continuar...")
-    
-   
 
-# BUCLE PRINCIPAL DEL PROGRAMA
-while True:
-    mostrar_menu()
-    opcion = obtener_opcion()
-    
-    if opcion == 1:
-        ejecutar_random_forest()
-    elif opcion == 2:
-        ejecutar_regresion_logistica()
-    elif opcion == 3:
+
+# EJECUCIÓN NO INTERACTIVA (lote de experimentos en procesos paralelos)
+def ejecutar_no_interactivo(args, X, y, preprocesador, y_binary):
+    modelos = ["random_forest", "logistic_regression"] if args.modelo == "todos" else [args.modelo]
+    if args.cv and args.modelo:
+        # Validación cruzada K-fold sobre todos los datos preprocesados (folds en paralelo)
+        X_preprocesado = preprocesador.transform(X)
+        for m in modelos:
+            validacion_cruzada(m, X_preprocesado, y_binary, cv=args.cv, n_jobs=args.n_jobs)
+    else:
+        if args.experimentos:
+            declaraciones = args.experimentos
+        else:
+            declaraciones = [{"modelo": m, "semillas": args.semillas} for m in modelos]
+        resumen = ejecutar_experimentos(declaraciones, X, y, preprocesador=preprocesador,
+                                        directorio=args.salida, n_jobs=args.n_jobs)
         print(f"\n" + "="*50)
-        print("SALIENDO DEL SISTEMA")
+        print("RESUMEN DE EXPERIMENTOS")
         print("="*50)
-        print("¡Gracias por usar el sistema de predicción de supervivencia!")
-        break
\ No newline at end of file
+        print(resumir_por_experimento(resumen).to_string())
+
+
+def main():
+    args = crear_parser().parse_args()
+    interactivo = args.modelo is None and args.experimentos is None
+    if not interactivo:
+        matplotlib.use("Agg")  # Backend sin ventanas: las figuras se guardan en archivos
+
+    X, y, preprocesador, y_binary, X_train, X_test, y_train, y_test = preparar_datos(interactivo)
+    if not interactivo:
+        ejecutar_no_interactivo(args, X, y, preprocesador, y_binary)
+        return
+
+    # BUCLE PRINCIPAL DEL PROGRAMA
+    while True:
+        mostrar_menu()
+        opcion = obtener_opcion()
+    
+        if opcion == 1:
+            ejecutar_random_forest(preprocesador, X_train, X_test, y_train, y_test)
+        elif opcion == 2:
+            ejecutar_regresion_logistica(preprocesador, X_train, X_test, y_train, y_test)
+        elif opcion == 3:
+            print(f"\n" + "="*50)
+            print("SALIENDO DEL SISTEMA")
+            print("="*50)
+            print("¡Gracias por usar el sistema de predicción de supervivencia!")
+            break
+
+
+# Solo al ejecutar el script: los procesos trabajadores (spawn en Windows/macOS) importan
+# este módulo y no deben volver a leer argumentos, cargar el dataset ni imprimir
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import argparse
 import cv2 as cv
 import numpy as np
 import os
+import threading
+import time
 
 # --- Limpieza de pantalla ---
 if os.name == "nt":  # Windows
@@ -28,74 +31,227 @@ net.setPreferableTarget(cv.dnn.DNN_TARGET_CPU)
 # Obtener los nombres de las capas de salida
 output_layers = [net.getLayerNames()[i - 1] for i in net.getUnconnectedOutLayers()]
 
-# --- Configuración de la cámara ---
-cam = cv.VideoCapture(0)
-if not cam.isOpened():
-    print("Error: No se pudo abrir la cámara web.")
-    exit()
+# Umbrales de confianza y de Non-Max Suppression
+CONFIDENCE_THRESHOLD = 0.5
+NMS_THRESHOLD = 0.4
 
-print("Iniciando detección de rostros... Presiona 'ESC' para salir.")
+# --- Resolución de entrada de la red ---
+# Tamaños soportados (múltiplos de 32): menor = más rápido, mayor = más preciso
+TAMANOS_ENTRADA = (320, 416, 608)
+# En modo adaptativo, confianzas por debajo de este valor se consideran dudosas
+CONFIANZA_DUDOSA = 0.6
 
-while True:
-    ret, frame = cam.read()
-    if not ret:
-        print("Error: No se pudo leer el fotograma.")
-        break
+parser = argparse.ArgumentParser(description="Detección de rostros con YOLO en tiempo real")
+parser.add_argument("--tamano", type=int, choices=TAMANOS_ENTRADA, default=416,
+                    help="tamaño de entrada de la red (modo fijo)")
+parser.add_argument("--adaptativo", action="store_true",
+                    help="usar el menor tamaño y re-ejecutar una vez al siguiente solo si hay "
+                         "rostros con confianza dudosa")
+args = parser.parse_args()
+
+
+def decodificar_detecciones(detections, width, height, conf_threshold):
+    """
+    Decodifica las salidas de YOLO de forma vectorizada (sin bucles por fila).
+
+    Cada fila de salida es [cx, cy, w, h, objectness, score_clase_0, ...] con
+    coordenadas normalizadas. Retorna las listas (boxes, confidences) que espera
+    cv.dnn.NMSBoxes, con boxes en formato [x, y, w, h] en píxeles.
+    """
+    # Unir las salidas de todas las escalas en una sola matriz (N filas)
+    salida = np.concatenate([output.reshape(-1, output.shape[-1]) for output in detections], axis=0)
+
+    # Mejor clase y su confianza para todas las filas a la vez
+    scores = salida[:, 5:]
+    confianzas = scores.max(axis=1)
+
+    # En los modelos de rostros, solo hay una clase, pero filtramos por confianza
+    mascara = confianzas > conf_threshold
+    if not np.any(mascara):
+        return [], []
+    candidatos = salida[mascara]
 
+    # Escalar las coordenadas del cuadro delimitador al tamaño de la imagen
+    center_x = (candidatos[:, 0] * width).astype(np.int32)
+    center_y = (candidatos[:, 1] * height).astype(np.int32)
+    w = (candidatos[:, 2] * width).astype(np.int32)
+    h = (candidatos[:, 3] * height).astype(np.int32)
+
+    # Coordenadas de la esquina superior izquierda
+    x = (center_x - w / 2).astype(np.int32)
+    y = (center_y - h / 2).astype(np.int32)
+
+    boxes = np.stack([x, y, w, h], axis=1).tolist()
+    return boxes, confianzas[mascara].astype(float).tolist()
+
+
+def detectar_rostros(frame, tamano):
+    """
+    Ejecuta YOLO sobre un fotograma con una entrada de tamano x tamano y retorna
+    la lista de (box, confianza) que sobreviven a Non-Max Suppression.
+    """
     height, width, _ = frame.shape
 
-    # --- Detección con YOLO ---
     # Crear un blob a partir de la imagen para la red neuronal
-    blob = cv.dnn.blobFromImage(frame, 1/255.0, (416, 416), swapRB=True, crop=False)
+    blob = cv.dnn.blobFromImage(frame, 1/255.0, (tamano, tamano), swapRB=True, crop=False)
     net.setInput(blob)
-    
+
     # Realizar la detección
     detections = net.forward(output_layers)
-
-    # --- Procesar detecciones ---
-    boxes = []
-    confidences = []
-    
-    for output in detections:
-        for detection in output:
-            scores = detection[5:]
-            class_id = np.argmax(scores)
-            confidence = scores[class_id]
-            
-            # En los modelos de rostros, solo hay una clase, pero filtramos por confianza
-            if confidence > 0.5:
-                # Escalar las coordenadas del cuadro delimitador al tamaño de la imagen
-                center_x = int(detection[0] * width)
-                center_y = int(detection[1] * height)
-                w = int(detection[2] * width)
-                h = int(detection[3] * height)
-                
-                # Coordenadas de la esquina superior izquierda
-                x = int(center_x - w / 2)
-                y = int(center_y - h / 2)
-                
-                boxes.append([x, y, w, h])
-                confidences.append(float(confidence))
+    boxes, confidences = decodificar_detecciones(detections, width, height, CONFIDENCE_THRESHOLD)
 
     # Aplicar Non-Max Suppression para eliminar cuadros superpuestos
-    indices = cv.dnn.NMSBoxes(boxes, confidences, 0.5, 0.4)
+    indices = cv.dnn.NMSBoxes(boxes, confidences, CONFIDENCE_THRESHOLD, NMS_THRESHOLD)
+    return [(boxes[i], confidences[i]) for i in np.array(indices).flatten()]
+
+
+def detectar_rostros_adaptativo(frame):
+    """
+    Detecta primero con el tamaño de entrada más pequeño y re-ejecuta una sola vez
+    con el siguiente tamaño solo si hay rostros con confianza dudosa. Un fotograma
+    sin detecciones no se re-ejecuta (es el caso más común y debe ser el más barato).
+    Las detecciones de ambos tamaños se fusionan con Non-Max Suppression para no
+    perder un rostro encontrado solo en el tamaño menor.
+    Retorna (detecciones, tamaño mayor usado).
+    """
+    tamanos = sorted(TAMANOS_ENTRADA)
+    detecciones = detectar_rostros(frame, tamanos[0])
+    if not detecciones or min(confianza for _, confianza in detecciones) >= CONFIANZA_DUDOSA:
+        return detecciones, tamanos[0]
+
+    detecciones += detectar_rostros(frame, tamanos[1])
+    boxes = [box for box, _ in detecciones]
+    confidences = [confianza for _, confianza in detecciones]
+    indices = cv.dnn.NMSBoxes(boxes, confidences, CONFIDENCE_THRESHOLD, NMS_THRESHOLD)
+    return [detecciones[i] for i in np.array(indices).flatten()], tamanos[1]
+
+
+class MedidorFPS:
+    """FPS promedio con suavizado exponencial."""
 
-    if len(indices) > 0:
-        for i in indices.flatten():
-            x, y, w, h = boxes[i]
-            # Dibujar el rectángulo y el texto de confianza
+    def __init__(self):
+        self.fps = 0.0
+        self.ultimo = None
+
+    def tick(self):
+        ahora = time.perf_counter()
+        if self.ultimo is not None and ahora > self.ultimo:
+            fps_actual = 1.0 / (ahora - self.ultimo)
+            self.fps = fps_actual if self.fps == 0.0 else 0.9 * self.fps + 0.1 * fps_actual
+        self.ultimo = ahora
+
+
+# --- Configuración de la cámara ---
+cam = cv.VideoCapture(0)
+if not cam.isOpened():
+    print("Error: No se pudo abrir la cámara web.")
+    exit()
+
+# --- Estado compartido entre hilos ---
+# Solo se conserva el último fotograma y el último resultado: si la inferencia
+# es más lenta que la cámara, los fotogramas intermedios se descartan.
+lock = threading.Lock()
+detener = threading.Event()
+nuevo_frame = threading.Condition(lock)
+ultimo_frame = None
+id_frame = 0
+ultimas_detecciones = []
+ultimo_tamano = min(TAMANOS_ENTRADA) if args.adaptativo else args.tamano
+fps_inferencia = MedidorFPS()
+
+
+def hilo_captura():
+    """Lee la cámara a su ritmo y publica el último fotograma."""
+    global ultimo_frame, id_frame
+    while not detener.is_set():
+        ret, frame = cam.read()
+        if not ret:
+            print("Error: No se pudo leer el fotograma.")
+            detener.set()
+            break
+        with nuevo_frame:
+            ultimo_frame = frame
+            id_frame += 1
+            nuevo_frame.notify_all()
+    with nuevo_frame:
+        nuevo_frame.notify_all()
+
+
+def hilo_inferencia():
+    """Procesa siempre el fotograma más reciente tan rápido como permita la CPU."""
+    global ultimas_detecciones, ultimo_tamano
+    procesado = 0
+    while not detener.is_set():
+        with nuevo_frame:
+            while id_frame == procesado and not detener.is_set():
+                nuevo_frame.wait(timeout=0.5)
+            if detener.is_set():
+                break
+            frame, procesado = ultimo_frame, id_frame
+
+        if args.adaptativo:
+            detecciones, tamano = detectar_rostros_adaptativo(frame)
+        else:
+            detecciones, tamano = detectar_rostros(frame, args.tamano), args.tamano
+        with lock:
+            ultimas_detecciones = detecciones
+            ultimo_tamano = tamano
+            fps_inferencia.tick()
+
+
+print("Iniciando detección de rostros... Presiona 'ESC' para salir.")
+if args.adaptativo:
+    print(f"Resolución de entrada adaptativa: {sorted(TAMANOS_ENTRADA)}")
+else:
+    print(f"Resolución de entrada: {args.tamano}x{args.tamano}")
+
+hilos = [threading.Thread(target=hilo_captura, daemon=True),
+         threading.Thread(target=hilo_inferencia, daemon=True)]
+for hilo in hilos:
+    hilo.start()
+
+# --- Bucle de visualización (hilo principal) ---
+fps_visualizacion = MedidorFPS()
+mostrado = 0
+
+while not detener.is_set():
+    with nuevo_frame:
+        if id_frame == mostrado:
+            nuevo_frame.wait(timeout=0.05)
+        if ultimo_frame is None or id_frame == mostrado:
+            frame = None
+        else:
+            frame, mostrado = ultimo_frame.copy(), id_frame
+        detecciones = ultimas_detecciones
+        tamano = ultimo_tamano
+        fps_inf = fps_inferencia.fps
+
+    if frame is not None:
+        fps_visualizacion.tick()
+
+        # Dibujar los resultados más recientes sobre el fotograma actual
+        for (x, y, w, h), confianza in detecciones:
             color = (0, 255, 0) # Verde
             cv.rectangle(frame, (x, y), (x + w, y + h), color, 2)
-            text = f"Rostro: {confidences[i]:.2f}"
+            text = f"Rostro: {confianza:.2f}"
             cv.putText(frame, text, (x, y - 5), cv.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
 
-    # --- Mostrar el resultado ---
-    cv.imshow('Detección de Rostros con YOLO', frame)
+        # --- FPS de visualización y de inferencia ---
+        cv.putText(frame, f"FPS video: {fps_visualizacion.fps:.1f}", (10, 25),
+                   cv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        cv.putText(frame, f"FPS inferencia: {fps_inf:.1f} ({tamano}x{tamano})", (10, 55),
+                   cv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+        # --- Mostrar el resultado ---
+        cv.imshow('Detección de Rostros con YOLO', frame)
 
     if cv.waitKey(1) & 0xFF == 27:  # Tecla 'ESC'
         break
 
 # --- Limpieza final ---
+detener.set()
+for hilo in hilos:
+    hilo.join(timeout=2.0)
 cam.release()
 cv.destroyAllWindows()
-print("Cámara y ventanas cerradas.")
\ No newline at end of file
+print("Cámara y ventanas cerradas.")
@@ -0,0 +1,69 @@
+"""
+Compuerta de movimiento para el Detector de Tapabocas
+Autor: Johan Charris Ochoa - Universidad de la Costa (CUC) - 2025
+"""
+
+import time
+import cv2
+import config as cfg
+
+class DetectorMovimiento:
+    """Compuerta de movimiento por diferencia contra un fondo adaptativo en grises reducidos."""
+
+    def __init__(self, pixel_threshold=cfg.MOTION_PIXEL_THRESHOLD, min_area_ratio=cfg.MOTION_MIN_AREA_RATIO,
+                 min_interval=cfg.MOTION_MIN_INTERVAL, max_idle_interval=cfg.MOTION_MAX_IDLE_INTERVAL):
+        """Inicializa umbrales de sensibilidad e intervalos de análisis."""
+        self.pixel_threshold = pixel_threshold
+        self.min_area_ratio = min_area_ratio
+        self.min_interval = min_interval
+        self.max_idle_interval = max_idle_interval
+        self.background = None
+        self.last_trigger = None
+        self.motion_ratio = 0.0
+
+    def _preprocess(self, frame):
+        """Reduce el frame a escala de grises de baja resolución y lo suaviza."""
+        height, width = frame.shape[:2]
+        scale = cfg.MOTION_DOWNSCALE_WIDTH / width
+        if scale < 1:
+            frame = cv2.resize(frame, (cfg.MOTION_DOWNSCALE_WIDTH, max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, cfg.MOTION_BLUR_KERNEL, 0)
+
+    def detect_motion(self, frame):
+        """Retorna True si la fracción de píxeles cambiados supera la sensibilidad configurada."""
+        gray = self._preprocess(frame)
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype("float32")
+            self.motion_ratio = 1.0
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)[1])
+        self.motion_ratio = changed / diff.size
+
+        # Fondo adaptativo para absorber cambios lentos de iluminación
+        cv2.accumulateWeighted(gray, self.background, cfg.MOTION_BG_LEARNING_RATE)
+        return self.motion_ratio >= self.min_area_ratio
+
+    def should_process(self, frame, now=None):
+        """Decide si el frame debe pasar al detector de personas (movimiento o inactividad máxima)."""
+        now = time.monotonic() if now is None else now
+        motion = self.detect_motion(frame)
+
+        if self.last_trigger is not None:
+            elapsed = now - self.last_trigger
+            if elapsed < self.min_interval:
+                return False
+            if not motion and elapsed < self.max_idle_interval:
+                return False
+
+        self.last_trigger = now
+        return True
+
+    def reset(self):
+        """Olvida el fondo aprendido y el último disparo."""
+        self.background = None
+        self.last_trigger = None
+        self.motion_ratio = 0.0
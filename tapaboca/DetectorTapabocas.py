@@ -11,8 +11,10 @@ import numpy as np
 from ultralytics import YOLO
 from datetime import datetime
 import config as cfg
+from DetectorMovimiento import DetectorMovimiento
 import os
 import platform
+import threading
 
 class DetectorTapabocas:
     """Detector de tapabocas con YOLOv8 y análisis de características faciales."""
@@ -40,6 +42,15 @@ class DetectorTapabocas:
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + cfg.CASCADE_FRONTAL_FACE)
         self.profile_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + cfg.CASCADE_PROFILE_FACE)
         
+        # Región de interés de la cámara (None = frame completo)
+        self.roi_polygon, self.roi_rect, self.roi_mask = self._init_roi()
+        
+        # Compuerta de movimiento para la detección automática continua
+        self.motion_gate = DetectorMovimiento()
+        self.auto_busy = False          # Hay un análisis automático en curso en el hilo de trabajo
+        self.auto_last_state = None     # Último resumen registrado en el log por el modo automático
+        self.model_lock = threading.Lock()  # YOLO no es seguro para llamadas concurrentes
+        
         self.setup_gui()
         self.init_camera()
         
@@ -52,6 +63,24 @@ class DetectorTapabocas:
             print(f"Error al cargar modelo YOLO: {e}")
             return None
     
+    def _init_roi(self):
+        """Carga el polígono ROI de la cámara activa, su rectángulo envolvente y su máscara."""
+        points = cfg.CAMERA_ROIS.get(cfg.CAMERA_INDEX) if cfg.ROI_ENABLED else None
+        if not points or len(points) < 3:
+            return None, None, None
+        
+        polygon = np.array(points, dtype=np.int32)
+        polygon[:, 0] = np.clip(polygon[:, 0], 0, cfg.CAMERA_WIDTH - 1)
+        polygon[:, 1] = np.clip(polygon[:, 1], 0, cfg.CAMERA_HEIGHT - 1)
+        x, y, w, h = cv2.boundingRect(polygon)
+        
+        # Máscara del polígono dentro del recorte; None si la ROI es el propio rectángulo
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.fillPoly(mask, [polygon - np.array([x, y], dtype=np.int32)], 255)
+        if cv2.countNonZero(mask) == w * h:
+            mask = None
+        return polygon, (x, y, x + w, y + h), mask
+    
     # ==================== CÁMARA Y VIDEO ====================
     def init_camera(self):
         """Inicializa cámara web y comienza captura de video."""
@@ -78,6 +107,8 @@ class DetectorTapabocas:
             if ret:
                 self.current_frame = cv2.flip(frame, 1)  # Efecto espejo
                 self._update_label_image(self.video_label, self.current_frame)
+                if cfg.AUTO_DETECTION_ENABLED:
+                    self._auto_detect()
             else:
                 self.video_label.config(text=cfg.MSG_ERROR_READ_FRAME, fg=cfg.COLOR_TEXT_BLACK)
         except:
@@ -86,6 +117,56 @@ class DetectorTapabocas:
         if self.video_running:
             self.root.after(cfg.VIDEO_UPDATE_INTERVAL, self.update_video_feed)
  
+    def _auto_detect(self):
+        """Lanza en segundo plano el análisis del frame actual si la compuerta de movimiento lo permite."""
+        if self.model is None or self.auto_busy:
+            return
+        
+        roi_frame, _ = self._crop_to_roi(self.current_frame)
+        if not self.motion_gate.should_process(roi_frame):
+            return
+        
+        self.auto_busy = True
+        frame = self.current_frame.copy()
+        threading.Thread(target=self._auto_worker, args=(frame,), daemon=True).start()
+    
+    def _auto_worker(self, frame):
+        """Hilo de trabajo: analiza el frame sin tocar la GUI y publica el resultado con root.after."""
+        try:
+            detecciones = self._analyze_image(frame)
+        except Exception:
+            detecciones = None
+        if self.video_running:
+            try:
+                self.root.after(0, self._auto_result, frame, detecciones)
+            except RuntimeError:
+                pass  # La ventana se cerró mientras se analizaba
+    
+    def _auto_result(self, frame, detecciones):
+        """Muestra el resultado automático (hilo de Tk); registra en el log solo los cambios de estado."""
+        self.auto_busy = False
+        if not self.video_running or detecciones is None:
+            return
+        
+        # No reemplazar una captura manual que el usuario está revisando
+        if not self.hay_foto:
+            self.imagen_procesada = frame
+            self.detecciones = detecciones
+            self.draw_detections()
+            self._update_estado_label(log=False)
+        
+        state = self._count_results(detecciones)
+        if state != self.auto_last_state:
+            self.auto_last_state = state
+            if state[0] > 0:
+                num_personas, con, sin, no_det = state
+                self._add_log_entry(cfg.MSG_AUTO_STATE_CHANGE, {
+                    'num_personas': num_personas, 'con_tapabocas': con, 'sin_tapabocas': sin,
+                    'no_detectado': no_det, 'detecciones': detecciones
+                })
+            else:
+                self._add_log_entry(f"{cfg.MSG_AUTO_STATE_CHANGE}\n{cfg.MSG_NO_PERSONS}")
+ 
     # ==================== MÉTODOS AUXILIARES DE CAMARA VIDEO Y CAPTURA DE IMAGENES INTERFAZ ====================
     
     def _resize_frame(self, frame, max_size=None): # Redimensiona frame para ajustar al panel si es necesario
@@ -261,10 +342,11 @@ class DetectorTapabocas:
         except:
             self.estado_label.config(text=cfg.MSG_ERROR_CAPTURE, fg=cfg.COLOR_TEXT_BLACK)
     
-    def detect_faces_in_person(self, x1, y1, x2, y2):
-        """Detecta rostros dentro de una región de persona."""
+    def detect_faces_in_person(self, x1, y1, x2, y2, image=None):
+        """Detecta rostros dentro de una región de persona (por defecto en la imagen capturada)."""
         try:
-            person_roi = self.imagen_capturada[y1:y2, x1:x2]
+            image = self.imagen_capturada if image is None else image
+            person_roi = image[y1:y2, x1:x2]
             if person_roi.size == 0:
                 return []
             
@@ -301,6 +383,42 @@ class DetectorTapabocas:
         return (x1 + face_x_offset, y1, x1 + face_x_offset + face_width, 
                 y1 + int(height * cfg.FACE_REGION_HEIGHT_RATIO))
     
+    def _crop_to_roi(self, image):
+        """Recorta la imagen a la ROI (fuera del polígono en negro) y retorna el offset."""
+        if self.roi_rect is None:
+            return image, (0, 0)
+        
+        rx1, ry1, rx2, ry2 = self.roi_rect
+        crop = image[ry1:ry2, rx1:rx2]
+        if crop.shape[:2] != (ry2 - ry1, rx2 - rx1):
+            return image, (0, 0)  # Frame de tamaño distinto al configurado
+        
+        # Polígono no rectangular: anular píxeles fuera de la ROI dentro del recorte
+        if self.roi_mask is not None:
+            crop = cv2.bitwise_and(crop, crop, mask=self.roi_mask)
+        return crop, (rx1, ry1)
+    
+    def _run_person_detector(self, image):
+        """Ejecuta YOLO sobre la ROI y retorna detecciones de personas en coordenadas del frame."""
+        roi_image, (off_x, off_y) = self._crop_to_roi(image)
+        
+        yolo_kwargs = {'conf': cfg.YOLO_CONFIDENCE, 'verbose': cfg.YOLO_VERBOSE}
+        if cfg.YOLO_INFERENCE_SIZE:
+            yolo_kwargs['imgsz'] = cfg.YOLO_INFERENCE_SIZE  # YOLO aplica letterbox al redimensionar
+        with self.model_lock:
+            results = self.model(roi_image, **yolo_kwargs)
+        
+        detections_raw = []
+        for result in results:
+            for box in result.boxes:
+                if int(box.cls[0]) == cfg.PERSON_CLASS_ID:  # Clase persona en COCO
+                    x1, y1, x2, y2 = map(int, box.xyxy[0])
+                    detections_raw.append({
+                        'bbox': (x1 + off_x, y1 + off_y, x2 + off_x, y2 + off_y),
+                        'confidence': float(box.conf[0])
+                    })
+        return detections_raw
+    
     def process_captured_image(self):
         """Procesa imagen con YOLO y clasifica tapabocas."""
         if self.imagen_capturada is None or self.model is None:
@@ -308,39 +426,8 @@ class DetectorTapabocas:
             return
         
         try:
-            results = self.model(self.imagen_capturada, conf=cfg.YOLO_CONFIDENCE, verbose=cfg.YOLO_VERBOSE)
-            
+            self.detecciones = self._analyze_image(self.imagen_capturada)
             self.imagen_procesada = self.imagen_capturada.copy()
-            self.detecciones = []
-            
-            # Extraer detecciones de personas
-            detections_raw = []
-            for result in results:
-                for box in result.boxes:
-                    if int(box.cls[0]) == cfg.PERSON_CLASS_ID:  # Clase persona en COCO
-                        x1, y1, x2, y2 = map(int, box.xyxy[0])
-                        detections_raw.append({
-                            'bbox': (x1, y1, x2, y2),
-                            'confidence': float(box.conf[0])
-                        })
-            
-            # Filtrar duplicados y procesar cada persona
-            for det in self.filter_duplicate_detections(detections_raw):
-                x1, y1, x2, y2 = det['bbox']
-                faces = self.detect_faces_in_person(x1, y1, x2, y2)
-                
-                # Usar rostros detectados o estimación
-                face_regions = faces if faces else [self.estimate_face_region(x1, y1, x2, y2)]
-                
-                for face_bbox in face_regions:
-                    tiene_tapabocas, metrics = self.classify_mask_in_bbox(*face_bbox)
-                    self.detecciones.append({
-                        'bbox': face_bbox,
-                        'confidence': det['confidence'] * (1.0 if faces else cfg.FACE_CONFIDENCE_PENALTY),
-                        'tiene_tapabocas': tiene_tapabocas,
-                        'metrics': metrics
-                    })
-            
             self.draw_detections()
             self._update_estado_label()
             self._print_analysis_summary()
@@ -348,6 +435,30 @@ class DetectorTapabocas:
         except:
             self.estado_label.config(text=cfg.MSG_ERROR_PROCESS, fg=cfg.COLOR_TEXT_BLACK)
 
+    def _analyze_image(self, image):
+        """Detecta personas y clasifica tapabocas en una imagen; no modifica la GUI ni el estado."""
+        # Extraer detecciones de personas (solo dentro de la ROI si está configurada)
+        detections_raw = self._run_person_detector(image)
+        detecciones = []
+        
+        # Filtrar duplicados y procesar cada persona
+        for det in self.filter_duplicate_detections(detections_raw):
+            x1, y1, x2, y2 = det['bbox']
+            faces = self.detect_faces_in_person(x1, y1, x2, y2, image=image)
+            
+            # Usar rostros detectados o estimación
+            face_regions = faces if faces else [self.estimate_face_region(x1, y1, x2, y2)]
+            
+            for face_bbox in face_regions:
+                tiene_tapabocas, metrics = self.classify_mask_in_bbox(*face_bbox, image=image)
+                detecciones.append({
+                    'bbox': face_bbox,
+                    'confidence': det['confidence'] * (1.0 if faces else cfg.FACE_CONFIDENCE_PENALTY),
+                    'tiene_tapabocas': tiene_tapabocas,
+                    'metrics': metrics
+                })
+        return detecciones
+    
     def filter_duplicate_detections(self, detections):
         """Filtra detecciones duplicadas por IoU, tamaño y proporción."""
         if len(detections) <= 1:
@@ -392,10 +503,11 @@ class DetectorTapabocas:
     
     # ==================== CLASIFICACIÓN DE TAPABOCAS ====================
     
-    def classify_mask_in_bbox(self, x1, y1, x2, y2):
+    def classify_mask_in_bbox(self, x1, y1, x2, y2, image=None):
         """Clasifica si hay tapabocas en la región facial (analiza nariz/boca)."""
         try:
-            roi = self.imagen_capturada[y1:y2, x1:x2]
+            image = self.imagen_capturada if image is None else image
+            roi = image[y1:y2, x1:x2]
             if roi.size == 0:
                 return 'NO DETECTADO', {}
             
@@ -518,18 +630,24 @@ class DetectorTapabocas:
     
     # ==================== VISUALIZACIÓN ====================
     
-    def _update_estado_label(self):
-        """Actualiza el label de estado con estadísticas y registra en el log."""
-        num_personas = len(self.detecciones)
+    def _count_results(self, detecciones):
+        """Retorna (personas, con tapabocas, sin tapabocas, no detectado)."""
+        con = sum(1 for d in detecciones if d['tiene_tapabocas'] == 'CON TAPABOCAS')
+        sin = sum(1 for d in detecciones if d['tiene_tapabocas'] == 'SIN TAPABOCAS')
+        no_det = sum(1 for d in detecciones if d['tiene_tapabocas'] == 'NO DETECTADO')
+        return len(detecciones), con, sin, no_det
+    
+    def _update_estado_label(self, log=True):
+        """Actualiza el label de estado con estadísticas y, si log es True, registra en el log."""
+        num_personas, con, sin, no_det = self._count_results(self.detecciones)
         if num_personas > 0:
-            con = sum(1 for d in self.detecciones if d['tiene_tapabocas'] == 'CON TAPABOCAS')
-            sin = sum(1 for d in self.detecciones if d['tiene_tapabocas'] == 'SIN TAPABOCAS')
-            no_det = sum(1 for d in self.detecciones if d['tiene_tapabocas'] == 'NO DETECTADO')
             
             texto = f"Estado: {num_personas} persona(s): {con} con tapabocas, {sin} sin tapabocas"
             if no_det > 0:
                 texto += f", {no_det} no detectado(s)"
             self.estado_label.config(text=texto, fg=cfg.COLOR_TEXT_BLACK)
+            if not log:
+                return
             
             # Agregar al log de análisis con métricas detalladas
             analysis_data = {
@@ -542,7 +660,8 @@ class DetectorTapabocas:
             self._add_log_entry(cfg.MSG_ANALYSIS_SUCCESS, analysis_data)
         else:
             self.estado_label.config(text=cfg.MSG_NO_DETECTION, fg=cfg.COLOR_TEXT_BLACK)
-            self._add_log_entry(cfg.MSG_NO_PERSONS)
+            if log:
+                self._add_log_entry(cfg.MSG_NO_PERSONS)
     
     def _clear_console(self):
         """Limpia la consola de manera multiplataforma."""
@@ -558,6 +677,11 @@ class DetectorTapabocas:
         print(f"   • Umbral confianza:     {cfg.YOLO_CONFIDENCE}")
         print(f"   • Umbral IoU:           {cfg.IOU_THRESHOLD}")
         print(f"   • Área mínima:          {cfg.MIN_DETECTION_AREA} píxeles")
+        print(f"   • Tamaño inferencia:    {cfg.YOLO_INFERENCE_SIZE or 'por defecto'}")
+        print(f"   • ROI:                  {self.roi_rect if self.roi_rect else 'frame completo'}")
+        if cfg.AUTO_DETECTION_ENABLED:
+            print(f"   • Compuerta movimiento: {cfg.MOTION_MIN_AREA_RATIO:.2%} píxeles, "
+                  f"inactividad máx. {cfg.MOTION_MAX_IDLE_INTERVAL}s")
         print(f"   • FPS video:            ~{cfg.VIDEO_FPS}")
         print(f"   • Resolución panel:     {cfg.PANEL_WIDTH}x{cfg.PANEL_HEIGHT}")
         print()
@@ -609,6 +733,10 @@ class DetectorTapabocas:
         }
         font = cv2.FONT_HERSHEY_SIMPLEX
         
+        # Contorno de la región de interés analizada
+        if cfg.ROI_DRAW and self.roi_polygon is not None:
+            cv2.polylines(self.imagen_procesada, [self.roi_polygon], True, cfg.ROI_COLOR, cfg.ROI_THICKNESS)
+        
         for i, det in enumerate(self.detecciones):
             x1, y1, x2, y2 = det['bbox']
             resultado = det.get('tiene_tapabocas', 'NO DETECTADO')
@@ -24,6 +24,31 @@ YOLO_MODEL_PATH = 'yolov8n.pt'
 YOLO_CONFIDENCE = 0.6
 YOLO_VERBOSE = False
 PERSON_CLASS_ID = 0  # Clase persona en COCO dataset
+YOLO_INFERENCE_SIZE = None  # Lado mayor (px, múltiplo de 32) con letterbox, ej. 320. None = tamaño del modelo (640)
+
+# ==================== REGIÓN DE INTERÉS (ROI) POR CÁMARA ====================
+# Con cámaras fijas las personas solo aparecen en una zona conocida (puerta/entrada).
+# YOLO y las cascadas procesan únicamente el recorte de esa zona.
+ROI_ENABLED = False
+# Polígono por índice de cámara: vértices (x, y) en píxeles del frame espejado
+# de CAMERA_WIDTH x CAMERA_HEIGHT. Sin entrada o None = frame completo.
+CAMERA_ROIS = {
+    0: [(160, 0), (480, 0), (480, 480), (160, 480)],
+}
+ROI_DRAW = True             # Dibujar el contorno de la ROI en la imagen analizada
+ROI_COLOR = (255, 255, 0)   # Cian
+ROI_THICKNESS = 1
+
+# ==================== DETECCIÓN AUTOMÁTICA CON COMPUERTA DE MOVIMIENTO ====================
+# Analiza el video de forma continua, pero solo ejecuta YOLO cuando la escena cambia
+AUTO_DETECTION_ENABLED = False
+MOTION_DOWNSCALE_WIDTH = 160        # Ancho (px) de la imagen en grises usada para comparar
+MOTION_BLUR_KERNEL = (5, 5)         # Suavizado para ignorar ruido del sensor
+MOTION_PIXEL_THRESHOLD = 25         # Diferencia mínima de intensidad para contar un píxel como cambio
+MOTION_MIN_AREA_RATIO = 0.01        # Sensibilidad: fracción de píxeles cambiados para disparar
+MOTION_BG_LEARNING_RATE = 0.05      # Adaptación del fondo a cambios lentos de iluminación
+MOTION_MIN_INTERVAL = 0.5           # Segundos mínimos entre análisis consecutivos
+MOTION_MAX_IDLE_INTERVAL = 10.0     # Segundos máximos sin análisis aunque no haya movimiento
 
 # ==================== CONFIGURACIÓN DE DETECCIÓN ====================
 IOU_THRESHOLD = 0.3
@@ -201,6 +226,7 @@ MSG_IMAGE_CLEARED = "🧹 Imagen limpiada. Sistema listo para nuevo análisis."
 MSG_LOG_CLEARED = "🔄 Log limpiado. Sistema reiniciado."
 MSG_ANALYSIS_SUCCESS = "✅ Análisis completado exitosamente"
 MSG_NO_PERSONS = "⚠️ No se detectaron personas en la imagen"
+MSG_AUTO_STATE_CHANGE = "🎥 Detección automática: cambio en la escena"
 MSG_CLOSING = "Cerrando aplicación..."
 MSG_STARTING = "Iniciando Detector de Tapabocas..."
 
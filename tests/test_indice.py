@@ -0,0 +1,63 @@
+"""
+Pruebas de IndiceVecinos: elección del método en 'auto' y recall del método aproximado
+"""
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_blobs
+from sklearn.neighbors import NearestNeighbors
+
+from knn import IndiceVecinos
+from knn.indice import DIMENSION_MAXIMA_KD_TREE
+
+
+@pytest.mark.parametrize('dimensiones, esperado', [
+    (2, 'kd_tree'),
+    (DIMENSION_MAXIMA_KD_TREE, 'kd_tree'),
+    (DIMENSION_MAXIMA_KD_TREE + 1, 'brute'),
+    (64, 'brute'),
+])
+def test_auto_elige_metodo_exacto_segun_dimension(dimensiones, esperado):
+    X = np.random.default_rng(0).normal(size=(200, dimensiones))
+    assert IndiceVecinos().fit(X).metodo_ == esperado
+
+
+@pytest.mark.parametrize('metodo', ['auto', 'kd_tree', 'ball_tree', 'brute'])
+def test_metodos_exactos_coinciden_con_fuerza_bruta(metodo):
+    rng = np.random.default_rng(1)
+    X, Q = rng.normal(size=(500, 20)), rng.normal(size=(50, 20))
+    distancias, indices = IndiceVecinos(metodo).fit(X).kneighbors(Q, n_neighbors=5)
+    distancias_ref, indices_ref = NearestNeighbors(n_neighbors=5, algorithm='brute').fit(X).kneighbors(Q)
+    np.testing.assert_allclose(distancias, distancias_ref, atol=1e-8)
+    np.testing.assert_array_equal(indices, indices_ref)
+
+
+def _recall(indices, indices_ref):
+    return np.mean([len(np.intersect1d(a, b)) / len(b) for a, b in zip(indices, indices_ref)])
+
+
+@pytest.mark.parametrize('agrupados', [True, False])
+def test_particiones_alcanza_recall_objetivo(agrupados):
+    rng = np.random.default_rng(2)
+    if agrupados:
+        X = make_blobs(20_000, 32, centers=50, random_state=0)[0]
+    else:
+        X = rng.normal(size=(20_000, 32))
+    Q = X[rng.choice(len(X), 300, replace=False)] + rng.normal(scale=0.01, size=(300, 32))
+
+    indice = IndiceVecinos('particiones', recall_objetivo=0.9).fit(X)
+    _, indices = indice.kneighbors(Q, n_neighbors=10)
+    _, indices_ref = NearestNeighbors(n_neighbors=10, algorithm='brute').fit(X).kneighbors(Q)
+
+    assert indice.recall_estimado_ >= 0.9
+    assert _recall(indices, indices_ref) >= 0.85
+    if agrupados:
+        # En datos agrupados bastan pocas celdas
+        assert indice.n_sondeos_ <= 16
+
+
+def test_particiones_con_n_sondeos_fijo_no_calibra():
+    X = np.random.default_rng(3).normal(size=(2_000, 20))
+    indice = IndiceVecinos('particiones', n_sondeos=4).fit(X)
+    assert indice.n_sondeos_ == 4
+    assert indice.recall_estimado_ is None